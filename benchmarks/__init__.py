@@ -0,0 +1 @@
+"""ベンチマークモジュール（リポジトリのルートから python -m benchmarks.<name> で実行）"""
@@ -0,0 +1,109 @@
+"""iTunesController ベンチマーク（COMセッションの記録・再生）
+
+Windows上で実際のiTunesとのCOMセッションを記録し、その記録をLinux等で再生して
+iTunesController.get_cd_info（CDソースの検出、プレイリスト走査、トラック取得）の
+処理時間とCOM呼び出し回数を計測する。
+
+使い方:
+    # 実機で記録（Windows + iTunes、CDを挿入した状態で実行）
+    python -m benchmarks.bench_itunes record recording.json [--source-id ID]
+    
+    # 合成した記録を生成（実機がない場合）
+    python -m benchmarks.bench_itunes generate recording.json [--tracks 20] [--latency-ms 2] [--source-id 2]
+    
+    # 記録を再生して計測（記録時と同じ --source-id を指定する）
+    python -m benchmarks.bench_itunes replay recording.json [--latency-scale 1.0] [--repeat 3] [--source-id ID]
+
+--source-id を指定すると、CD挿入イベントで通知されたソースIDから直接CDソースを
+取得する経路（ソース一覧を走査しない）を記録・計測する。
+"""
+
+import argparse
+import logging
+import time
+from typing import Optional
+
+from controllers.itunes_controller import iTunesController
+from controllers.com_backend import ComBackend, Win32ComBackend, RecordingBackend, ReplayBackend
+from tests.fakes import FakeBackend, FakeCom
+
+
+def _make_controller(backend: ComBackend) -> iTunesController:
+    return iTunesController(itunes_path='', backend=backend)
+
+
+def record(path: str, backend: ComBackend, source_id: Optional[int] = None):
+    """get_cd_info を1回実行してCOMセッションを記録"""
+    recorder = RecordingBackend(backend, path)
+    controller = _make_controller(recorder)
+    
+    started_at = time.perf_counter()
+    cd_info = controller.get_cd_info(source_id=source_id)
+    elapsed = time.perf_counter() - started_at
+    
+    recorder.save()
+    if cd_info:
+        print(f"記録完了: {cd_info.artist} - {cd_info.album} ({cd_info.num_tracks}トラック), {elapsed:.3f}秒")
+    else:
+        print(f"CD情報を取得できませんでした（記録は保存済み）, {elapsed:.3f}秒")
+
+
+def replay(path: str, latency_scale: float, repeat: int, source_id: Optional[int] = None):
+    """記録を再生して get_cd_info を計測"""
+    backend = ReplayBackend(path, latency_scale=latency_scale)
+    
+    for i in range(repeat):
+        backend.reset()
+        controller = _make_controller(backend)
+        
+        started_at = time.perf_counter()
+        cd_info = controller.get_cd_info(source_id=source_id)
+        elapsed = time.perf_counter() - started_at
+        
+        stats = controller.last_extraction_stats
+        tracks = cd_info.num_tracks if cd_info else 0
+        extraction = (
+            f", トラック取得 {stats.calls}回/{stats.elapsed * 1000:.1f}ms" if stats else ""
+        )
+        print(
+            f"[{i + 1}/{repeat}] get_cd_info: {elapsed * 1000:.1f}ms, "
+            f"COM呼び出し {backend.call_count}回{extraction}, {tracks}トラック"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    p_record = sub.add_parser('record', help='実機のiTunesとのCOMセッションを記録')
+    p_record.add_argument('path')
+    p_record.add_argument('--source-id', type=int, help='CD挿入イベントで通知されたソースID')
+    
+    p_generate = sub.add_parser('generate', help='合成したiTunesでCOMセッションを記録')
+    p_generate.add_argument('path')
+    p_generate.add_argument('--tracks', type=int, default=20)
+    p_generate.add_argument('--latency-ms', type=float, default=2.0, help='COM呼び出し1回あたりの遅延（ミリ秒）')
+    p_generate.add_argument('--source-id', type=int, help='CDソースのID（合成iTunesのCDは2）')
+    
+    p_replay = sub.add_parser('replay', help='記録を再生して計測')
+    p_replay.add_argument('path')
+    p_replay.add_argument('--latency-scale', type=float, default=1.0, help='記録された遅延に掛ける係数（0で遅延なし）')
+    p_replay.add_argument('--repeat', type=int, default=3)
+    p_replay.add_argument('--source-id', type=int, help='記録時に指定したソースID')
+    
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    
+    if args.command == 'record':
+        record(args.path, Win32ComBackend(), args.source_id)
+    elif args.command == 'generate':
+        FakeCom.latency = args.latency_ms / 1000
+        record(args.path, FakeBackend(args.tracks), args.source_id)
+    else:
+        replay(args.path, args.latency_scale, args.repeat, args.source_id)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""TrackMatcher ベンチマーク
+
+100トラック以上のリリースに5件の候補がある状況で、旧来の総当たり実装と
+TrackMatcher.match_tracks の処理時間を比較し、結果が同一であることを確認する。
+1対1割り当て（assignment）方式の処理時間も併せて表示する。
+
+使い方:
+    python -m benchmarks.bench_matcher [--tracks 120] [--candidates 5] [--repeat 3]
+"""
+
+import argparse
+import random
+import string
+import time
+from difflib import SequenceMatcher
+from typing import List, Optional, Dict
+
+from models.track import Track
+from models.search_result import SearchResult
+from search.matcher import TrackMatcher
+
+
+def _random_title(rng: random.Random) -> str:
+    """英語風のランダムなタイトルを生成"""
+    words = []
+    for _ in range(rng.randint(1, 5)):
+        words.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9))))
+    return ' '.join(words).title()
+
+
+def _mutate(title: str, rng: random.Random) -> str:
+    """表記揺れを模したタイトル変形"""
+    choice = rng.random()
+    if choice < 0.4:
+        return title
+    if choice < 0.6:
+        return f"{title} (Remastered)"
+    if choice < 0.8:
+        chars = list(title)
+        pos = rng.randrange(len(chars))
+        chars[pos] = rng.choice(string.ascii_lowercase)
+        return ''.join(chars)
+    return title.upper()
+
+
+def build_dataset(num_tracks: int, num_candidates: int, seed: int = 1):
+    """原題トラックと検索結果候補を生成"""
+    rng = random.Random(seed)
+    titles = [_random_title(rng) for _ in range(num_tracks)]
+    
+    original_tracks = [
+        Track(number=i + 1, title=title, title_en=title)
+        for i, title in enumerate(titles)
+    ]
+    
+    search_results = []
+    for c in range(num_candidates):
+        tracks = []
+        # 候補ごとに曲順のずれや欠落・追加曲を入れる
+        offset = rng.randint(0, 2)
+        for i, title in enumerate(titles):
+            if rng.random() < 0.05:
+                continue
+            tracks.append({
+                'number': i + 1 + offset,
+                'title_ja': f"邦題{i + 1}",
+                'title_en': _mutate(title, rng)
+            })
+        for extra in range(rng.randint(0, 5)):
+            tracks.append({
+                'number': len(tracks) + 1,
+                'title_ja': f"ボーナス{extra + 1}",
+                'title_en': _random_title(rng)
+            })
+        search_results.append(SearchResult(
+            source='wikipedia' if c == 0 else 'musicbrainz',
+            album_title=f"Candidate {c + 1}",
+            tracks=tracks,
+            confidence='high' if c == 0 else 'medium'
+        ))
+    
+    return original_tracks, search_results
+
+
+def brute_force_match(matcher: TrackMatcher, original_tracks: List[Track],
+                      search_results: List[SearchResult]) -> List[Optional[Dict]]:
+    """旧来の総当たり実装（比較用）"""
+    matched = []
+    
+    for orig_track in original_tracks:
+        best_match = None
+        best_score = 0
+        
+        for result in search_results:
+            for result_track in result.tracks:
+                orig_title = orig_track.title_en.lower()
+                result_title = result_track.get('title_en', '').lower()
+                title_similarity = SequenceMatcher(None, orig_title, result_title).ratio()
+                number_match = 1.0 if orig_track.number == result_track.get('number', 0) else 0.5
+                score = title_similarity * 0.7 + number_match * 0.3
+                
+                if score > best_score and score > matcher.SIMILARITY_THRESHOLD:
+                    best_score = score
+                    best_match = {
+                        'original': orig_track,
+                        'matched': result_track,
+                        'similarity': score,
+                        'source': result.source,
+                        'confidence': result.confidence
+                    }
+        
+        matched.append(best_match)
+    
+    return matched
+
+
+def _same_matches(a: List[Optional[Dict]], b: List[Optional[Dict]]) -> bool:
+    """マッチング結果が同一か（同一のトラック辞書を選んでいるか）"""
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if (x is None) != (y is None):
+            return False
+        if x is not None and (x['matched'] is not y['matched'] or x['similarity'] != y['similarity']):
+            return False
+    return True
+
+
+def _measure(func, repeat: int) -> float:
+    """最短実行時間（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tracks', type=int, default=120)
+    parser.add_argument('--candidates', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    
+    original_tracks, search_results = build_dataset(args.tracks, args.candidates, args.seed)
+    matcher = TrackMatcher()
+    
+    expected = brute_force_match(matcher, original_tracks, search_results)
+    actual = matcher.match_tracks(original_tracks, search_results)
+    if not _same_matches(expected, actual):
+        raise SystemExit("✗ マッチング結果が総当たり実装と一致しません")
+    
+    pairs = len(original_tracks) * sum(len(r.tracks) for r in search_results)
+    legacy = _measure(lambda: brute_force_match(matcher, original_tracks, search_results), args.repeat)
+    indexed = _measure(lambda: matcher.match_tracks(original_tracks, search_results), args.repeat)
+    assignment = _measure(
+        lambda: matcher.match_tracks(original_tracks, search_results, mode=TrackMatcher.MODE_ASSIGNMENT),
+        args.repeat
+    )
+    
+    print(f"トラック数: {len(original_tracks)} / 候補数: {len(search_results)} / 組み合わせ: {pairs}")
+    print(f"総当たり:   {legacy * 1000:8.1f} ms")
+    print(f"索引付き:   {indexed * 1000:8.1f} ms  (x{legacy / indexed:.1f})")
+    print(f"1対1割り当て: {assignment * 1000:6.1f} ms")
+    print("✓ マッチング結果は総当たり実装と同一です")
+
+
+if __name__ == '__main__':
+    main()
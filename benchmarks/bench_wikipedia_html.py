@@ -0,0 +1,250 @@
+"""Wikipedia トラックリスト抽出エンジン ベンチマーク
+
+保存したjawikiのアルバム記事HTML（コーパス）に対して、html_extractors の各エンジン
+（lxml / strainer / soup）でトラックリストを抽出し、1ページあたりの処理時間と
+メモリ使用量のピークを比較する。抽出結果が従来の実装（soup）と同一であることも確認する。
+
+メモリは tracemalloc で計測するため、lxml（libxml2）がC側で確保する分は含まれない。
+
+使い方:
+    # 実際の記事を取得してコーパスに保存（ページ全体のHTML）
+    python -m benchmarks.bench_wikipedia_html fetch corpus/ "アビイ・ロード" "SONGS (シュガー・ベイブのアルバム)"
+    
+    # 記事を模した合成ページを生成（ネットワークに接続できない場合）
+    python -m benchmarks.bench_wikipedia_html generate corpus/ [--pages 20] [--tracks 12]
+    
+    # コーパスを計測
+    python -m benchmarks.bench_wikipedia_html run corpus/ [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+from search.html_extractors import EXTRACTORS, HtmlExtractor
+from search.wikipedia_searcher import WikipediaSearcher
+
+
+def fetch(corpus_dir: Path, titles: List[str]):
+    """記事のHTMLを取得してコーパスに保存"""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    searcher = WikipediaSearcher()
+    
+    for title in titles:
+        try:
+            response = searcher.session.get(
+                searcher.API_URL,
+                params={
+                    'action': 'parse',
+                    'format': 'json',
+                    'page': title,
+                    'prop': 'text',
+                    'disablelimitreport': 1,
+                    'disableeditsection': 1
+                },
+                timeout=searcher.TIMEOUT
+            )
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"取得エラー: {title}: {e}")
+            continue
+        
+        if 'parse' not in data:
+            print(f"記事がありません: {title}")
+            continue
+        
+        path = corpus_dir / f"{data['parse']['pageid']}.html"
+        path.write_text(data['parse']['text']['*'], encoding='utf-8')
+        print(f"保存: {title} -> {path}")
+
+
+def _paragraph(rng: random.Random) -> str:
+    """リンクや脚注を含む本文の段落"""
+    sentences = []
+    for _ in range(rng.randint(3, 8)):
+        link = f'<a href="/wiki/Link{rng.randint(1, 999)}" title="リンク">リンク{rng.randint(1, 999)}</a>'
+        ref = f'<sup id="cite_ref-{rng.randint(1, 99)}" class="reference"><a href="#cite_note">[{rng.randint(1, 30)}]</a></sup>'
+        sentences.append(f"このアルバムは{link}で録音された作品である。{ref}")
+    return f"<p>{''.join(sentences)}</p>\n"
+
+
+def _heading(text: str, level: int, new_markup: bool) -> str:
+    """見出し（新形式: 見出し要素にid、旧形式: span.mw-headline にid）"""
+    if new_markup:
+        return f'<div class="mw-heading mw-heading{level}"><h{level} id="{text}">{text}</h{level}></div>\n'
+    return f'<h{level}><span class="mw-headline" id="{text}">{text}</span></h{level}>\n'
+
+
+def _track_title(rng: random.Random, number: int) -> str:
+    title = f'<a href="/wiki/Song{number}" title="曲{number}">曲{number}</a>'
+    if rng.random() < 0.5:
+        title += f' (原題: <i>Song {number}</i>)'
+    if rng.random() < 0.3:
+        title += f' – {rng.randint(2, 6)}:{rng.randint(0, 59):02d}'
+    return title
+
+
+def _page(rng: random.Random, num_tracks: int) -> str:
+    """アルバム記事を模したページ"""
+    new_markup = rng.random() < 0.5
+    parts = ['<div class="mw-content-ltr mw-parser-output" lang="ja" dir="ltr">\n']
+    
+    # 基本情報（infobox）
+    parts.append('<table class="infobox">')
+    for key in ('リリース', '録音', 'ジャンル', '時間', 'レーベル', 'プロデュース'):
+        parts.append(f'<tr><th>{key}</th><td><a href="/wiki/X">値</a><br />補足</td></tr>')
+    parts.append('</table>\n')
+    
+    for _ in range(rng.randint(2, 5)):
+        parts.append(_paragraph(rng))
+    
+    # 目次
+    parts.append('<div id="toc" class="toc"><ul>')
+    for i in range(1, 6):
+        parts.append(f'<li class="toclevel-1"><a href="#s{i}"><span class="tocnumber">{i}</span></a></li>')
+    parts.append('</ul></div>\n')
+    
+    parts.append(_heading('背景', 2, new_markup))
+    for _ in range(rng.randint(3, 10)):
+        parts.append(_paragraph(rng))
+    
+    parts.append(_heading('収録曲', 2, new_markup))
+    if rng.random() < 0.7:
+        parts.append('<ol>')
+        for number in range(1, num_tracks + 1):
+            parts.append(f'<li>{_track_title(rng, number)}<!-- コメント --></li>\n')
+        parts.append('</ol>\n')
+    else:
+        parts.append('<table class="tracklist"><tr><th>#</th><th>タイトル</th><th>原題</th></tr>')
+        for number in range(1, num_tracks + 1):
+            parts.append(
+                f'<tr><td>{number}.</td><td><a href="/wiki/Song{number}">曲{number}</a></td>'
+                f'<td>Song {number}</td></tr>'
+            )
+        parts.append('</table>\n')
+    
+    parts.append(_heading('参加ミュージシャン', 2, new_markup))
+    parts.append('<ul>')
+    for i in range(rng.randint(5, 15)):
+        parts.append(f'<li><a href="/wiki/M{i}">ミュージシャン{i}</a> – ギター</li>')
+    parts.append('</ul>\n')
+    
+    parts.append(_heading('脚注', 2, new_markup))
+    parts.append('<ol class="references">')
+    for i in range(1, rng.randint(10, 40)):
+        parts.append(f'<li id="cite_note-{i}"><span class="reference-text">出典{i}</span></li>')
+    parts.append('</ol>\n')
+    
+    # ナビゲーションボックス
+    parts.append('<div class="navbox"><table class="nowraplinks">')
+    for i in range(rng.randint(10, 30)):
+        parts.append(f'<tr><th>作品{i}</th><td><a href="/wiki/A{i}">アルバム{i}</a> · <a href="/wiki/B{i}">シングル{i}</a></td></tr>')
+    parts.append('</table></div>\n')
+    
+    parts.append('</div>')
+    return ''.join(parts)
+
+
+def generate(corpus_dir: Path, pages: int, tracks: int, seed: int):
+    """合成ページのコーパスを生成"""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    
+    for i in range(pages):
+        path = corpus_dir / f"synthetic_{i:03d}.html"
+        path.write_text(_page(rng, rng.randint(max(1, tracks // 2), tracks * 2)), encoding='utf-8')
+    print(f"{pages}ページを生成しました: {corpus_dir}")
+
+
+def _extract(searcher: WikipediaSearcher, extractor: HtmlExtractor, html_content: str) -> List[Dict]:
+    searcher.extractor = extractor
+    return searcher._parse_tracklist_html(html_content)
+
+
+def run(corpus_dir: Path, repeat: int):
+    """コーパスの各ページをエンジンごとに計測"""
+    pages = {path.name: path.read_text(encoding='utf-8') for path in sorted(corpus_dir.glob('*.html'))}
+    if not pages:
+        print(f"コーパスにページがありません: {corpus_dir}")
+        return
+    
+    total_kb = sum(len(html.encode('utf-8')) for html in pages.values()) / 1024
+    print(f"{len(pages)}ページ（計 {total_kb:.0f}KB）, 繰り返し {repeat}回\n")
+    
+    searcher = WikipediaSearcher(batch_fetch=False)
+    reference = {
+        name: _extract(searcher, EXTRACTORS['soup'](), html)
+        for name, html in pages.items()
+    }
+    
+    print(f"{'エンジン':<10}{'時間/ページ':>14}{'最大ピーク':>14}{'平均ピーク':>14}  一致")
+    for engine_name, extractor_class in EXTRACTORS.items():
+        extractor = extractor_class()
+        if not extractor.is_available():
+            print(f"{engine_name:<10}（利用不可）")
+            continue
+        
+        # 処理時間（ページごとに repeat 回の中央値）
+        timings = []
+        mismatches = []
+        for name, html in pages.items():
+            samples = []
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                tracks = _extract(searcher, extractor, html)
+                samples.append(time.perf_counter() - started_at)
+            timings.append(statistics.median(samples))
+            if tracks != reference[name]:
+                mismatches.append(name)
+        
+        # メモリ（ページごとのピーク）
+        peaks = []
+        for html in pages.values():
+            tracemalloc.start()
+            _extract(searcher, extractor, html)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        
+        match = 'OK' if not mismatches else f"NG ({', '.join(mismatches)})"
+        print(
+            f"{engine_name:<10}{statistics.mean(timings) * 1000:>12.2f}ms"
+            f"{max(peaks) / 1024:>12.0f}KB{statistics.mean(peaks) / 1024:>12.0f}KB  {match}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    p_fetch = sub.add_parser('fetch', help='記事を取得してコーパスに保存')
+    p_fetch.add_argument('corpus_dir', type=Path)
+    p_fetch.add_argument('titles', nargs='+')
+    
+    p_generate = sub.add_parser('generate', help='記事を模した合成ページを生成')
+    p_generate.add_argument('corpus_dir', type=Path)
+    p_generate.add_argument('--pages', type=int, default=20)
+    p_generate.add_argument('--tracks', type=int, default=12)
+    p_generate.add_argument('--seed', type=int, default=0)
+    
+    p_run = sub.add_parser('run', help='コーパスを計測')
+    p_run.add_argument('corpus_dir', type=Path)
+    p_run.add_argument('--repeat', type=int, default=5)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'fetch':
+        fetch(args.corpus_dir, args.titles)
+    elif args.command == 'generate':
+        generate(args.corpus_dir, args.pages, args.tracks, args.seed)
+    else:
+        run(args.corpus_dir, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,5 +2,11 @@
 
 from .itunes_controller import iTunesController
 from .eac_controller import EACController
+from .process_monitor import ProcessMonitor
+from .status_monitor import StatusMonitor
+from .cd_event_watcher import CDEventWatcher
+from .com_worker import ComWorker
+from .com_backend import ComBackend, Win32ComBackend, RecordingBackend, ReplayBackend
 
-__all__ = ['iTunesController', 'EACController']
+__all__ = ['iTunesController', 'EACController', 'ProcessMonitor', 'StatusMonitor', 'CDEventWatcher', 'ComWorker',
+           'ComBackend', 'Win32ComBackend', 'RecordingBackend', 'ReplayBackend']
@@ -0,0 +1,236 @@
+"""CD挿入イベント監視モジュール"""
+
+import threading
+import time
+import logging
+from typing import Callable, Optional, Set
+
+try:
+    import pythoncom
+    import win32com.client
+    import win32event
+    WIN32COM_AVAILABLE = True
+except ImportError:
+    WIN32COM_AVAILABLE = False
+
+
+# iTunesのソース種別（ITSourceKind）: オーディオCD
+SOURCE_KIND_AUDIO_CD = 3
+
+
+class CDEventWatcher:
+    """
+    iTunesのCOMイベントでCDの挿入を検出するクラス
+    
+    専用スレッドでiTunesのイベント（OnDatabaseChangedEvent）を購読し、
+    新しく追加されたソースがオーディオCDであれば on_cd_inserted(ソースID) を呼ぶ。
+    ソース一覧を定期的に走査する必要はない。
+    
+    イベントの受信には接続したスレッドでメッセージを処理し続ける必要があるため、
+    iTunesController の共有接続（ComWorker）は使わず、監視スレッドで専用の接続を持つ
+    （「COM接続は1つを使い回す」方針の唯一の例外）。共有接続で待たせると、
+    get_cd_info のような長い呼び出しの間イベントが届かなくなる。
+    
+    iTunesを勝手に起動しないよう、接続はiTunesプロセスの起動を確認してから行う。
+    iTunesの終了イベントを受けた後は、終了処理中のプロセスに接続して再起動させて
+    しまわないよう、プロセスの終了を確認するまで再接続しない。
+    """
+    
+    # iTunesの起動確認・イベント待機の間隔（秒）
+    ATTACH_INTERVAL = 2.0
+    PUMP_TIMEOUT_MS = 1000
+    # 終了確認ダイアログの後、終了がキャンセルされたとみなすまでの時間（秒）
+    QUIT_PROMPT_TIMEOUT = 60.0
+    
+    def __init__(self, on_cd_inserted: Callable[[int], None],
+                 is_itunes_running: Callable[[], bool]):
+        """
+        初期化
+        
+        Args:
+            on_cd_inserted: CD挿入時に呼ばれるコールバック関数(ソースID)
+                            ※監視スレッドから呼ばれる
+            is_itunes_running: iTunesプロセスが起動中か判定する関数
+                               ※COM接続を試みないもの（プロセス監視の結果など）
+        """
+        self.on_cd_inserted = on_cd_inserted
+        self.is_itunes_running = is_itunes_running
+        self.logger = logging.getLogger(__name__)
+        
+        self._known_cd_sources: Set[int] = set()
+        self._app = None
+        self._quitting = False
+        self._exit_deadline: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._stop_handle = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def is_available(self) -> bool:
+        """イベント監視が利用可能かチェック"""
+        return WIN32COM_AVAILABLE
+    
+    def start(self) -> bool:
+        """
+        監視スレッドを開始
+        
+        Returns:
+            開始できたかどうか
+        """
+        if not self.is_available():
+            self.logger.debug("pywin32がないためCD挿入イベントは監視しません")
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        
+        self._stop_event.clear()
+        self._stop_handle = win32event.CreateEvent(None, 0, 0, None)
+        self._thread = threading.Thread(target=self._run, name='cd-event-watcher', daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        """監視スレッドを停止"""
+        self._stop_event.set()
+        if self._stop_handle is not None:
+            win32event.SetEvent(self._stop_handle)
+        if self._thread:
+            self._thread.join(timeout=self.PUMP_TIMEOUT_MS / 1000 + 1)
+            self._thread = None
+    
+    def _run(self):
+        """iTunesの起動を待って接続し、終了したら再び起動を待つ"""
+        pythoncom.CoInitialize()
+        try:
+            while not self._stop_event.is_set():
+                running = self.is_itunes_running()
+                if self._exit_deadline is not None:
+                    if running and time.monotonic() < self._exit_deadline:
+                        # 終了処理中のiTunesには接続しない
+                        self._stop_event.wait(self.ATTACH_INTERVAL)
+                        continue
+                    self._exit_deadline = None
+                if running:
+                    try:
+                        self._attach_and_pump()
+                    except Exception as e:
+                        self.logger.debug(f"iTunesイベント監視エラー: {e}")
+                    finally:
+                        self._app = None
+                self._stop_event.wait(self.ATTACH_INTERVAL)
+        finally:
+            pythoncom.CoUninitialize()
+    
+    def _attach_and_pump(self):
+        """イベントを購読し、停止またはiTunes終了までメッセージを処理"""
+        self._quitting = False
+        self._app = win32com.client.Dispatch('iTunes.Application')
+        sink = win32com.client.WithEvents(self._app, _ITunesEventSink)
+        sink.watcher = self
+        
+        # 接続時点で挿入済みのCDは通知対象外
+        self._known_cd_sources = self._current_cd_sources()
+        self.logger.info("iTunesのCD挿入イベントの監視を開始しました")
+        
+        try:
+            while not self._stop_event.is_set() and not self._quitting:
+                rc = win32event.MsgWaitForMultipleObjects(
+                    [self._stop_handle], False, self.PUMP_TIMEOUT_MS, win32event.QS_ALLINPUT
+                )
+                if rc == win32event.WAIT_OBJECT_0:
+                    break
+                pythoncom.PumpWaitingMessages()
+        finally:
+            sink.close()
+            self.logger.info("iTunesのCD挿入イベントの監視を終了しました")
+    
+    def _current_cd_sources(self) -> Set[int]:
+        """現在のオーディオCDソースのID"""
+        source_ids = set()
+        sources = self._app.Sources
+        for i in range(1, sources.Count + 1):
+            try:
+                source = _cast_to_source(sources.Item(i))
+                if source.Kind == SOURCE_KIND_AUDIO_CD:
+                    source_ids.add(source.sourceID)
+            except Exception:
+                continue
+        return source_ids
+    
+    def _on_database_changed(self, deleted_ids, changed_ids):
+        """
+        データベース変更イベントの処理
+        
+        Args:
+            deleted_ids: 削除されたオブジェクトのID配列 [(ソース, プレイリスト, トラック, DB), ...]
+            changed_ids: 変更・追加されたオブジェクトのID配列
+        """
+        # 取り出されたCDソースを忘れる（再挿入時に再び通知するため）
+        for ids in deleted_ids or ():
+            if len(ids) >= 3 and ids[1] == 0 and ids[2] == 0:
+                self._known_cd_sources.discard(ids[0])
+        
+        new_sources = {ids[0] for ids in (changed_ids or ()) if ids} - self._known_cd_sources
+        for source_id in new_sources:
+            try:
+                source = self._app.GetITObjectByID(source_id, 0, 0, 0)
+                if source is None:
+                    continue
+                source = _cast_to_source(source)
+                if source.Kind != SOURCE_KIND_AUDIO_CD:
+                    continue
+            except Exception as e:
+                self.logger.debug(f"ソースID {source_id} の取得に失敗: {e}")
+                continue
+            
+            self._known_cd_sources.add(source_id)
+            self.logger.info(f"CDの挿入を検出しました: {source.Name}")
+            try:
+                self.on_cd_inserted(source_id)
+            except Exception as e:
+                self.logger.error(f"CD挿入時の処理でエラー: {e}")
+    
+    def _on_quitting(self, prompt: bool = False):
+        """
+        iTunes終了イベントの処理（COM参照を解放するため購読を終え、プロセスの終了を待つ）
+        
+        Args:
+            prompt: 終了確認ダイアログの前の通知か（ユーザーが終了をキャンセルしうる）
+        """
+        self._quitting = True
+        if prompt:
+            deadline = time.monotonic() + self.QUIT_PROMPT_TIMEOUT
+            if self._exit_deadline is None:
+                self._exit_deadline = deadline
+        else:
+            self._exit_deadline = float('inf')
+
+
+def _cast_to_source(obj):
+    """
+    GetITObjectByID の戻り値を IITSource として扱えるようにする
+    
+    gen_py の型情報がある（Dispatch が事前バインディングになる）と基底の IITObject
+    として返り、Kind を読めないためキャストする。遅延バインディングではそのまま使える。
+    """
+    try:
+        return win32com.client.CastTo(obj, 'IITSource')
+    except Exception:
+        return obj
+
+
+class _ITunesEventSink:
+    """iTunes COMイベント（_IiTunesEvents）の受け口"""
+    
+    watcher: Optional[CDEventWatcher] = None
+    
+    def OnDatabaseChangedEvent(self, deletedObjectIDs, changedObjectIDs):
+        if self.watcher:
+            self.watcher._on_database_changed(deletedObjectIDs, changedObjectIDs)
+    
+    def OnAboutToPromptUserToQuitEvent(self):
+        if self.watcher:
+            self.watcher._on_quitting(prompt=True)
+    
+    def OnQuittingEvent(self):
+        if self.watcher:
+            self.watcher._on_quitting()
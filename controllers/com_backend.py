@@ -0,0 +1,400 @@
+"""COMバックエンドモジュール
+
+iTunesControllerがCOMオブジェクトを生成する部分を差し替え可能にする。
+
+- Win32ComBackend: pywin32で実際のiTunesに接続する（既定）
+- RecordingBackend: 他のバックエンドをラップし、COMセッション（オブジェクト、
+  プロパティ値、メソッド呼び出し、呼び出しごとの所要時間）をJSONファイルに記録する
+- ReplayBackend: 記録したセッションを再生する。Windows/iTunesのない環境でも
+  get_cd_info の処理をそのまま実行・計測できる
+"""
+
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import win32com.client
+    WIN32COM_AVAILABLE = True
+except ImportError:
+    WIN32COM_AVAILABLE = False
+
+
+RECORDING_VERSION = 1
+
+
+class ComReplayError(Exception):
+    """再生時のCOMエラー（記録されたエラー、または記録にない呼び出し）"""
+    pass
+
+
+class ComBackend:
+    """COMバックエンドの基底クラス"""
+    
+    def is_available(self) -> bool:
+        """バックエンドが利用可能かチェック"""
+        return False
+    
+    def dispatch(self, prog_id: str) -> Any:
+        """
+        COMオブジェクトを生成
+        
+        Args:
+            prog_id: ProgID（例: iTunes.Application）
+        
+        Returns:
+            COMオブジェクト（失敗時は例外を送出）
+        """
+        raise NotImplementedError
+    
+    def cast(self, obj: Any, interface: str) -> Any:
+        """
+        COMオブジェクトを派生インターフェースとして扱う
+        
+        事前バインディングでは GetITObjectByID などが基底インターフェース（IITObject）
+        のラッパーを返すため、派生インターフェースのプロパティ（Kind等）を読むには
+        キャストが必要になる。既定では何もしない（名前で解決する遅延バインディング向け）。
+        
+        Args:
+            obj: COMオブジェクト
+            interface: インターフェース名（例: IITSource）
+        
+        Returns:
+            キャストしたCOMオブジェクト
+        """
+        return obj
+
+
+class Win32ComBackend(ComBackend):
+    """pywin32による実際のCOMバックエンド"""
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+    
+    def is_available(self) -> bool:
+        return WIN32COM_AVAILABLE
+    
+    def dispatch(self, prog_id: str) -> Any:
+        """
+        COMオブジェクトを生成（可能なら事前バインディング）
+        
+        生成済みの型情報（gencache）を使うとプロパティ取得のたびに
+        GetIDsOfNames を呼ばずに済む。型情報を生成できない環境では
+        遅延バインディングの Dispatch にフォールバックする。
+        """
+        try:
+            app = win32com.client.gencache.EnsureDispatch(prog_id)
+            self.logger.debug(f"事前バインディングで接続しました: {prog_id}")
+            return app
+        except Exception as e:
+            self.logger.debug(f"事前バインディングに失敗したため遅延バインディングを使用: {e}")
+            return win32com.client.Dispatch(prog_id)
+    
+    def cast(self, obj: Any, interface: str) -> Any:
+        """事前バインディングのラッパーを CastTo でキャスト（できなければそのまま返す）"""
+        try:
+            return win32com.client.CastTo(obj, interface)
+        except Exception as e:
+            self.logger.debug(f"{interface}へのキャストに失敗したためそのまま使用: {e}")
+            return obj
+
+
+class RecordingBackend(ComBackend):
+    """
+    COMセッションを記録するバックエンド
+    
+    ラップしたバックエンドが返すCOMオブジェクトをプロキシで包み、アクセスごとに
+    結果と所要時間を記録する。save() でファイルに書き出す。
+    """
+    
+    def __init__(self, inner: ComBackend, path: str):
+        """
+        初期化
+        
+        Args:
+            inner: 実際に接続するバックエンド
+            path: 記録ファイルのパス
+        """
+        self.inner = inner
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self.roots: Dict[str, int] = {}
+        # オブジェクトID -> {アクセスキー: [観測結果, ...]}
+        self.objects: List[Dict[str, List[Dict]]] = []
+    
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+    
+    def dispatch(self, prog_id: str) -> Any:
+        started_at = time.perf_counter()
+        app = self.inner.dispatch(prog_id)
+        proxy = self._wrap(app)
+        self.roots[prog_id] = proxy._com_id
+        self.logger.debug(
+            f"COMセッションの記録を開始: {prog_id} ({(time.perf_counter() - started_at) * 1000:.1f}ms)"
+        )
+        return proxy
+    
+    def cast(self, obj: Any, interface: str) -> Any:
+        # キャスト後も同じCOMオブジェクトなので、記録上は同じIDのまま扱う
+        # （再生時は基底クラスの cast でそのまま返せばよい）
+        if isinstance(obj, _RecordingProxy):
+            cast = self.inner.cast(_unwrap(obj), interface)
+            return _RecordingProxy(self, cast, object.__getattribute__(obj, '_com_id'))
+        return self.inner.cast(obj, interface)
+    
+    def save(self):
+        """記録をファイルに書き出す"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': RECORDING_VERSION,
+            'roots': self.roots,
+            'objects': self.objects
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        self.logger.info(f"COMセッションを記録しました: {self.path} ({len(self.objects)}オブジェクト)")
+    
+    def _wrap(self, obj: Any) -> '_RecordingProxy':
+        """COMオブジェクトに記録用のIDを振ってプロキシで包む"""
+        self.objects.append({})
+        return _RecordingProxy(self, obj, len(self.objects) - 1)
+    
+    def _record(self, com_id: int, key: str, observation: Dict):
+        self.objects[com_id].setdefault(key, []).append(observation)
+    
+    def _encode(self, value: Any) -> Dict:
+        """戻り値を記録用の形式に変換（COMオブジェクトはIDで参照）"""
+        if _is_com_object(value):
+            return {'o': self._wrap(value)._com_id}
+        return {'v': _encode_value(value)}
+
+
+class _RecordingProxy:
+    """COMオブジェクトへのアクセスを記録するプロキシ"""
+    
+    def __init__(self, recorder: RecordingBackend, obj: Any, com_id: int):
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_com_id', com_id)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        recorder = self._recorder
+        started_at = time.perf_counter()
+        try:
+            value = getattr(self._obj, name)
+        except Exception as e:
+            recorder._record(self._com_id, name, _encode_error(e, started_at))
+            raise
+        
+        elapsed = _elapsed_ms(started_at)
+        if callable(value) and not _is_com_object(value):
+            recorder._record(self._com_id, name, {'m': True, 'ms': elapsed})
+            return _RecordingMethod(recorder, self._com_id, name, value)
+        
+        observation = recorder._encode(value)
+        observation['ms'] = elapsed
+        recorder._record(self._com_id, name, observation)
+        if 'o' in observation:
+            return _RecordingProxy(recorder, value, observation['o'])
+        return value
+    
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._obj, name, value)
+    
+    def __iter__(self):
+        recorder = self._recorder
+        started_at = time.perf_counter()
+        try:
+            items = list(self._obj)
+        except Exception as e:
+            recorder._record(self._com_id, '__iter__', _encode_error(e, started_at))
+            raise
+        
+        encoded = [recorder._encode(item) for item in items]
+        recorder._record(self._com_id, '__iter__', {'l': encoded, 'ms': _elapsed_ms(started_at)})
+        return iter([
+            _RecordingProxy(recorder, item, enc['o']) if 'o' in enc else item
+            for item, enc in zip(items, encoded)
+        ])
+
+
+class _RecordingMethod:
+    """COMメソッド呼び出しを記録するラッパー"""
+    
+    def __init__(self, recorder: RecordingBackend, com_id: int, name: str, method):
+        self._recorder = recorder
+        self._com_id = com_id
+        self._name = name
+        self._method = method
+    
+    def __call__(self, *args):
+        recorder = self._recorder
+        key = _call_key(self._name, args)
+        started_at = time.perf_counter()
+        try:
+            value = self._method(*(_unwrap(a) for a in args))
+        except Exception as e:
+            recorder._record(self._com_id, key, _encode_error(e, started_at))
+            raise
+        
+        observation = recorder._encode(value)
+        observation['ms'] = _elapsed_ms(started_at)
+        recorder._record(self._com_id, key, observation)
+        if 'o' in observation:
+            return _RecordingProxy(recorder, value, observation['o'])
+        return value
+
+
+class ReplayBackend(ComBackend):
+    """
+    記録したCOMセッションを再生するバックエンド
+    
+    同じアクセスが複数回記録されている場合は記録順に結果を返し、使い切った後は
+    最後の結果を返し続ける（CD認識待ちのように値が変化する様子も再現される）。
+    """
+    
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        """
+        初期化
+        
+        Args:
+            path: 記録ファイルのパス
+            latency_scale: 記録された所要時間に掛ける係数（0で待機なし）
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != RECORDING_VERSION:
+            raise ValueError(f"未対応の記録形式です: {data.get('version')}")
+        
+        self.roots: Dict[str, int] = data['roots']
+        self.objects: List[Dict[str, List[Dict]]] = data['objects']
+        self.latency_scale = latency_scale
+        self.call_count = 0
+        self._cursors: Dict[tuple, int] = {}
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def dispatch(self, prog_id: str) -> Any:
+        if prog_id not in self.roots:
+            raise ComReplayError(f"記録にないProgIDです: {prog_id}")
+        return _ReplayObject(self, self.roots[prog_id])
+    
+    def reset(self):
+        """再生位置を先頭に戻す"""
+        self._cursors.clear()
+        self.call_count = 0
+    
+    def _next(self, com_id: int, key: str) -> Dict:
+        """記録から次の観測結果を取り出す（所要時間分だけ待機）"""
+        observations = self.objects[com_id].get(key)
+        if not observations:
+            raise ComReplayError(f"記録にない呼び出しです: オブジェクト{com_id}.{key}")
+        
+        cursor = self._cursors.get((com_id, key), 0)
+        observation = observations[min(cursor, len(observations) - 1)]
+        self._cursors[(com_id, key)] = cursor + 1
+        self.call_count += 1
+        
+        if self.latency_scale > 0 and observation.get('ms'):
+            time.sleep(observation['ms'] * self.latency_scale / 1000)
+        
+        if 'e' in observation:
+            error_type = _ERROR_TYPES.get(observation.get('t'), ComReplayError)
+            raise error_type(observation['e'])
+        return observation
+    
+    def _decode(self, observation: Dict) -> Any:
+        if 'o' in observation:
+            return _ReplayObject(self, observation['o'])
+        return observation.get('v')
+
+
+class _ReplayObject:
+    """記録から再生されるCOMオブジェクト"""
+    
+    def __init__(self, backend: ReplayBackend, com_id: int):
+        object.__setattr__(self, '_backend', backend)
+        object.__setattr__(self, '_com_id', com_id)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        observation = self._backend._next(self._com_id, name)
+        if observation.get('m'):
+            return _ReplayMethod(self._backend, self._com_id, name)
+        return self._backend._decode(observation)
+    
+    def __setattr__(self, name: str, value: Any):
+        # 再生時は書き込みを無視する
+        pass
+    
+    def __iter__(self):
+        observation = self._backend._next(self._com_id, '__iter__')
+        return iter([self._backend._decode(item) for item in observation['l']])
+
+
+class _ReplayMethod:
+    """記録から再生されるCOMメソッド"""
+    
+    def __init__(self, backend: ReplayBackend, com_id: int, name: str):
+        self._backend = backend
+        self._com_id = com_id
+        self._name = name
+    
+    def __call__(self, *args):
+        observation = self._backend._next(self._com_id, _call_key(self._name, args))
+        return self._backend._decode(observation)
+
+
+# 再生時にそのままの型で再送出する例外（hasattr 等の判定を記録時と同じにするため）
+_ERROR_TYPES = {
+    'AttributeError': AttributeError,
+    'TypeError': TypeError,
+}
+
+
+def _is_com_object(value: Any) -> bool:
+    """pywin32のCOMオブジェクト（またはそのプロキシ）かどうか"""
+    return hasattr(value, '_oleobj_')
+
+
+def _unwrap(value: Any) -> Any:
+    """記録用プロキシを元のCOMオブジェクトに戻す（メソッド引数用）"""
+    if isinstance(value, _RecordingProxy):
+        return object.__getattribute__(value, '_obj')
+    return value
+
+
+def _call_key(name: str, args: tuple) -> str:
+    """メソッド呼び出しの記録キー（引数を含む）"""
+    encoded = []
+    for arg in args:
+        if isinstance(arg, (_RecordingProxy, _ReplayObject)):
+            # COMオブジェクトの引数は記録上のIDで表す
+            encoded.append({'o': object.__getattribute__(arg, '_com_id')})
+        else:
+            encoded.append(_encode_value(arg))
+    return f"{name}({json.dumps(encoded, ensure_ascii=False)})"
+
+
+def _encode_value(value: Any) -> Any:
+    """JSONに保存できる値に変換"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    return str(value)
+
+
+def _encode_error(error: Exception, started_at: float) -> Dict:
+    return {'e': str(error), 't': type(error).__name__, 'ms': _elapsed_ms(started_at)}
+
+
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000, 3)
@@ -0,0 +1,122 @@
+"""COM専用スレッドモジュール"""
+
+import queue
+import threading
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+try:
+    import pythoncom
+    PYTHONCOM_AVAILABLE = True
+except ImportError:
+    PYTHONCOM_AVAILABLE = False
+
+
+# スレッド停止要求を表す番兵
+_STOP = object()
+
+
+class ComWorker:
+    """
+    COM呼び出しを1つの専用スレッド（COMアパートメント）で実行するクラス
+    
+    COMオブジェクトは生成したアパートメントのスレッドで使うのが原則のため、
+    GUIや任意のワーカースレッドからの呼び出しはキューに積み、専用スレッドで順番に実行する。
+    専用スレッド上からの呼び出しはその場で実行する（入れ子の呼び出しでも詰まらない）。
+    """
+    
+    def __init__(self, name: str = 'com-worker'):
+        """
+        初期化
+        
+        Args:
+            name: スレッド名
+        """
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pending = 0
+    
+    def call(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        関数を専用スレッドで実行して結果を返す（例外はそのまま送出）
+        
+        Args:
+            func: 実行する関数
+            timeout: 結果を待つ最大時間（秒）。func には渡さない。
+                     時間内に終わらなければ、未実行の場合は取り消して TimeoutError を送出する
+        """
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)
+        
+        future: Future = Future()
+        self._ensure_thread()
+        with self._lock:
+            self._pending += 1
+        self._queue.put((future, func, args, kwargs))
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"{self.name}: {getattr(func, '__name__', func)} が{timeout}秒以内に終わりませんでした")
+    
+    def is_busy(self) -> bool:
+        """実行中または待機中の呼び出しがあるか"""
+        with self._lock:
+            return self._pending > 0
+    
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        専用スレッドを停止（キュー済みの呼び出しは実行してから終了）
+        
+        Args:
+            timeout: 終了を待つ最大時間（秒）
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._lock:
+            if self._thread is thread:
+                self._thread = None
+    
+    def _ensure_thread(self):
+        """専用スレッドが動いていなければ開始"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """キューから呼び出しを取り出して順に実行"""
+        if PYTHONCOM_AVAILABLE:
+            pythoncom.CoInitialize()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                
+                future, func, args, kwargs = item
+                try:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(func(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+        finally:
+            if PYTHONCOM_AVAILABLE:
+                pythoncom.CoUninitialize()
@@ -2,76 +2,220 @@
 
 import time
 import logging
+import functools
 import subprocess
 from pathlib import Path
-from typing import Optional, Tuple
-
-try:
-    import win32com.client
-    WIN32COM_AVAILABLE = True
-except ImportError:
-    WIN32COM_AVAILABLE = False
-
-try:
-    import win32api
-    import win32process
-    WIN32API_AVAILABLE = True
-except ImportError:
-    WIN32API_AVAILABLE = False
+from typing import Optional, Tuple, Callable, List, Iterator
 
 from models.cd_info import CDInfo
 from models.track import Track
+from .process_monitor import ProcessMonitor
+from .com_backend import ComBackend, Win32ComBackend
+from .com_worker import ComWorker
+
+
+def _on_com_thread(method):
+    """メソッドをCOM専用スレッドで実行するデコレータ"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._com_worker.call(method, self, *args, **kwargs)
+    return wrapper
 
 
 class iTunesController:
-    """iTunes制御クラス"""
+    """
+    iTunes制御クラス
+    
+    COMへの接続は1つを使い回し、応答しなくなった場合のみ再接続する。
+    COM呼び出しはすべて専用スレッド（ComWorker）で実行されるため、
+    公開メソッドはどのスレッドから呼び出してもよい（ただし処理中の呼び出しの
+    完了を待つため、GUIスレッドからは close() 以外を直接呼ばないこと）。
+    CD挿入イベントの購読（CDEventWatcher）だけは例外として別の接続を持つ。
+    """
     
-    def __init__(self, itunes_path: str, startup_wait: int = 10, cd_recognition_wait: int = 5):
+    # 準備完了待ちのポーリング間隔（秒）: 初回値から係数倍ずつ上限まで延ばす
+    POLL_INITIAL_INTERVAL = 0.1
+    POLL_MAX_INTERVAL = 1.0
+    POLL_BACKOFF = 1.5
+    
+    # CDソースのリフレッシュ後に待つ最大時間（秒）
+    REFRESH_WAIT = 2
+    
+    # close() でCOM専用スレッドの終了を待つ最大時間（秒）
+    CLOSE_TIMEOUT = 2
+    
+    def __init__(self, itunes_path: str, startup_wait: int = 10, cd_recognition_wait: int = 5,
+                 process_check_interval: float = 2.0, backend: Optional[ComBackend] = None):
         """
         初期化
         
         Args:
             itunes_path: iTunes実行ファイルのパス
-            startup_wait: 起動待機時間（秒）
-            cd_recognition_wait: CD認識待機時間（秒）
+            startup_wait: 起動待機時間の上限（秒）
+            cd_recognition_wait: CD認識待機時間の上限（秒）
+            process_check_interval: プロセス監視の更新間隔（秒）
+            backend: COMバックエンド（省略時はpywin32。記録・再生用に差し替え可能）
         """
         self.itunes_path = Path(itunes_path)
         self.startup_wait = startup_wait
         self.cd_recognition_wait = cd_recognition_wait
         self.logger = logging.getLogger(__name__)
+        self.backend = backend or Win32ComBackend()
         self.app: Optional[object] = None
+        self._com_worker = ComWorker('itunes-com')
+        self.last_extraction_stats: Optional[_ComCallStats] = None
+        self.process_monitor = ProcessMonitor(
+            'iTunes.exe',
+            ttl=process_check_interval,
+            poll_interval=process_check_interval
+        )
     
     def is_available(self) -> bool:
         """iTunesが利用可能かチェック"""
-        if not WIN32COM_AVAILABLE:
+        if not self.backend.is_available():
             self.logger.error("pywin32がインストールされていません")
             return False
         return True
     
+    def _wait_until(self, condition: Callable[[], bool], timeout: float) -> bool:
+        """
+        条件が満たされるまでポーリングで待機（間隔は徐々に延ばす）
+        
+        Args:
+            condition: 準備完了を判定する関数
+            timeout: 待機時間の上限（秒）
+        
+        Returns:
+            上限時間内に条件が満たされたかどうか
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.POLL_INITIAL_INTERVAL
+        
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception as e:
+                self.logger.debug(f"準備完了チェックエラー: {e}")
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.POLL_BACKOFF, self.POLL_MAX_INTERVAL)
+    
+    def _try_connect(self) -> bool:
+        """COMオブジェクトへの接続を1回試行し、応答すれば保持する"""
+        com_app, com_success = self._get_com_object(retry_count=1)
+        if not (com_success and com_app):
+            return False
+        
+        # 起動直後はDispatchできても応答しないことがあるため、プロパティを読んで確認
+        com_app.Sources.Count
+        self.app = com_app
+        return True
+    
+    def _find_cd_playlist(self, cd_source):
+        """
+        CDソースから「ライブラリ」以外でトラックのあるプレイリストを探す
+        
+        Returns:
+            CDプレイリスト、見つからない場合はNone
+        """
+        playlists = cd_source.Playlists
+        for i in range(1, playlists.Count + 1):
+            try:
+                playlist = playlists.Item(i)
+                playlist_name = playlist.Name
+                track_count = playlist.Tracks.Count
+                self.logger.debug(f"プレイリスト {i}: {playlist_name} (トラック数: {track_count})")
+                
+                if playlist_name != "ライブラリ" and track_count > 0:
+                    return playlist
+            except Exception as e:
+                self.logger.debug(f"プレイリスト {i} の取得に失敗: {e}")
+                continue
+        return None
+    
     def _check_process_running(self) -> bool:
         """
         プロセス名でiTunesの起動を検出
         
+        判定はプロセス監視のキャッシュから返すため、頻繁に呼び出してもよい。
+        
         Returns:
             iTunesプロセスが実行中かどうか
         """
+        running = self.process_monitor.is_running()
+        if running:
+            self.logger.debug("iTunesプロセスを検出しました")
+        else:
+            self.logger.debug("iTunesプロセスが見つかりませんでした")
+        return running
+    
+    def is_running_cached(self) -> bool:
+        """
+        iTunesが起動中かチェック（COM接続を試みない軽量版）
+        
+        プロセス監視の結果のみで判定する。接続済みのCOMオブジェクトはiTunesが
+        ツール外で終了しても残るため、判定には使わない。
+        状態表示のように頻繁に呼び出す用途向け。
+        
+        Returns:
+            iTunesが起動中かどうか
+        """
+        return self.process_monitor.is_running()
+    
+    def start_monitoring(self):
+        """プロセス監視を開始（バックグラウンドで起動状態を更新）"""
+        self.process_monitor.start()
+    
+    def stop_monitoring(self):
+        """プロセス監視を停止"""
+        self.process_monitor.stop()
+    
+    def close(self):
+        """
+        監視とCOM専用スレッドを停止し、COM接続を解放（iTunesは終了しない）
+        
+        GUIの終了時に呼ばれるため、CD情報の取得などCOM処理の途中であれば
+        完了を待たずに戻る（接続はプロセスの終了とともに解放される）。
+        """
+        self.stop_monitoring()
+        if self._com_worker.is_busy():
+            self.logger.info("COM処理の途中のため、完了を待たずに終了します")
+            self._com_worker.shutdown(timeout=0)
+            return
+        
         try:
-            # tasklistコマンドでiTunes.exeプロセスを検索
-            result = subprocess.run(
-                ['tasklist', '/FI', 'IMAGENAME eq iTunes.exe', '/FO', 'CSV', '/NH'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0 and 'iTunes.exe' in result.stdout:
-                self.logger.debug("iTunesプロセスを検出しました")
-                return True
-            else:
-                self.logger.debug("iTunesプロセスが見つかりませんでした")
-                return False
+            self._com_worker.call(self._release_connection, timeout=self.CLOSE_TIMEOUT)
+        except TimeoutError as e:
+            self.logger.warning(f"COM接続の解放を待たずに終了します: {e}")
+            self._com_worker.shutdown(timeout=0)
+            return
+        self._com_worker.shutdown(timeout=self.CLOSE_TIMEOUT)
+    
+    def _release_connection(self):
+        """COM接続を解放"""
+        self.app = None
+    
+    def _is_connected(self) -> bool:
+        """
+        保持しているCOM接続が応答するかチェック（応答しなければ破棄）
+        
+        Returns:
+            接続が使えるかどうか
+        """
+        if self.app is None:
+            return False
+        try:
+            self.app.Version
+            return True
         except Exception as e:
-            self.logger.debug(f"プロセス検出エラー: {e}")
+            self.logger.info(f"iTunesとのCOM接続が切れたため再接続します: {e}")
+            self.app = None
+            self.process_monitor.invalidate()
             return False
     
     def _get_com_object(self, retry_count: int = 3, retry_interval: float = 1.0) -> Tuple[Optional[object], bool]:
@@ -85,7 +229,7 @@ class iTunesController:
         Returns:
             (COMオブジェクト, 成功したかどうか)
         """
-        if not WIN32COM_AVAILABLE:
+        if not self.backend.is_available():
             return None, False
         
         for attempt in range(retry_count):
@@ -96,7 +240,7 @@ class iTunesController:
                 for prog_id in prog_ids:
                     try:
                         self.logger.debug(f"COMオブジェクト取得を試行中: {prog_id} (試行 {attempt + 1}/{retry_count})")
-                        app = win32com.client.Dispatch(prog_id)
+                        app = self.backend.dispatch(prog_id)
                         self.logger.info(f"COMオブジェクトを取得しました: {prog_id}")
                         return app, True
                     except Exception as e:
@@ -115,10 +259,79 @@ class iTunesController:
         
         return None, False
     
+    def _extract_tracks(self, track_collection) -> Tuple[List[Track], str, str, str]:
+        """
+        トラックコレクションからトラック情報を一括取得
+        
+        コレクションは列挙子でまとめて走査し（Item呼び出しを省略）、
+        アーティスト・ジャンル・年はアルバム単位の値が得られた時点で読むのをやめる。
+        COM呼び出し回数と所要時間は last_extraction_stats に記録する。
+        
+        Args:
+            track_collection: トラックコレクション（IITTrackCollection）
+        
+        Returns:
+            (トラックリスト, アーティスト, ジャンル, 年)
+        """
+        stats = _ComCallStats()
+        self.last_extraction_stats = stats
+        
+        artist = ""
+        genre = ""
+        year = ""
+        tracks = []
+        
+        track_count = stats.get(track_collection, 'Count')
+        self.logger.debug(f"トラック数: {track_count}")
+        
+        if track_count == 0:
+            self.logger.warning("トラックが0件です")
+            return tracks, artist, genre, year
+        
+        for idx, track_obj in enumerate(stats.iterate(track_collection, track_count), 1):
+            try:
+                track_name = stats.get(track_obj, 'Name') or f"Track {idx}"
+                track_artist = stats.get(track_obj, 'Artist') or ""
+                track_duration = stats.get(track_obj, 'Duration') or 0
+                
+                self.logger.debug(f"トラック{idx}: {track_name} - {track_artist} ({track_duration}秒)")
+                
+                if not artist and track_artist:
+                    artist = track_artist
+                if not genre:
+                    genre = stats.get(track_obj, 'Genre', '') or ""
+                if not year:
+                    track_year = stats.get(track_obj, 'Year', 0)
+                    if track_year:
+                        year = str(track_year)
+                
+                track = Track(
+                    number=idx,
+                    title=track_name,
+                    title_en=track_name,
+                    artist=track_artist or artist,
+                    duration=int(float(track_duration))
+                )
+                tracks.append(track)
+            except Exception as e:
+                self.logger.warning(f"トラック{idx}の取得に失敗: {e}")
+                import traceback
+                self.logger.debug(traceback.format_exc())
+                continue
+        
+        self.logger.info(
+            f"トラック情報を取得: {len(tracks)}件, COM呼び出し{stats.calls}回, "
+            f"{stats.elapsed * 1000:.0f}ms"
+        )
+        return tracks, artist, genre, year
+    
+    @_on_com_thread
     def start(self) -> bool:
         """
         iTunesを起動（ハイブリッド方式）
         
+        接続済みで応答がある場合は何もしない。
+        
         Returns:
             成功したかどうか
         """
@@ -126,6 +339,9 @@ class iTunesController:
             self.logger.error("pywin32が利用できません")
             return False
         
+        if self._is_connected():
+            return True
+        
         # 既に起動しているかチェック（プロセス検出）
         if self._check_process_running():
             self.logger.info("iTunesプロセスは既に起動しています")
@@ -152,14 +368,16 @@ class iTunesController:
             try:
                 self.logger.info(f"iTunesを起動します: {self.itunes_path}")
                 subprocess.Popen([str(self.itunes_path)])
-                self.logger.info(f"iTunes起動待機中... ({self.startup_wait}秒)")
-                time.sleep(self.startup_wait)
+                self.process_monitor.invalidate()
+                self.logger.info(f"iTunes起動待機中... (最大{self.startup_wait}秒)")
                 
-                # 再度COMオブジェクトを取得（リトライ付き）
-                com_app, com_success = self._get_com_object(retry_count=3, retry_interval=1.0)
-                if com_success and com_app:
-                    self.app = com_app
-                    self.logger.info("iTunesを起動し、COMオブジェクトを取得しました")
+                # COMオブジェクトが応答するまで待機
+                started_at = time.monotonic()
+                if self._wait_until(self._try_connect, self.startup_wait):
+                    self.logger.info(
+                        f"iTunesを起動し、COMオブジェクトを取得しました"
+                        f"（{time.monotonic() - started_at:.1f}秒）"
+                    )
                     return True
                 else:
                     self.logger.error("iTunesは起動しましたが、COMオブジェクトに接続できませんでした")
@@ -174,6 +392,7 @@ class iTunesController:
         
         return False
     
+    @_on_com_thread
     def is_running(self) -> bool:
         """
         iTunesが起動中かチェック（ハイブリッド方式）
@@ -182,6 +401,11 @@ class iTunesController:
         Returns:
             iTunesが起動中かどうか
         """
+        # 接続済みで応答があれば再接続しない
+        if self._is_connected():
+            self.logger.debug("iTunes起動中（COM接続済み）")
+            return True
+        
         # まずプロセスで検出
         process_running = self._check_process_running()
         
@@ -205,6 +429,7 @@ class iTunesController:
         self.logger.debug("iTunesは起動していません")
         return False
     
+    @_on_com_thread
     def stop(self) -> bool:
         """
         iTunesを終了
@@ -218,6 +443,7 @@ class iTunesController:
         try:
             self.app.Quit()
             self.app = None
+            self.process_monitor.invalidate()
             self.logger.info("iTunesを終了しました")
             return True
         except Exception as e:
@@ -239,29 +465,108 @@ class iTunesController:
             if hasattr(cd_source, 'Refresh'):
                 self.logger.info("CDソースをリフレッシュ中...")
                 cd_source.Refresh()
-                time.sleep(2)  # リフレッシュ後の待機
-                return True
             elif hasattr(cd_source, 'Update'):
                 self.logger.info("CDソースを更新中...")
                 cd_source.Update()
-                time.sleep(2)
-                return True
             else:
                 self.logger.debug("CDソースにRefresh/Updateメソッドがありません")
                 return False
+            
+            # リフレッシュ後、プレイリストが読めるようになるまで待機
+            self._wait_until(
+                lambda: self._find_cd_playlist(cd_source) is not None,
+                self.REFRESH_WAIT
+            )
+            return True
         except Exception as e:
             self.logger.warning(f"CDソースのリフレッシュに失敗: {e}")
             return False
     
-    def get_cd_info(self) -> Optional[CDInfo]:
+    def _get_source_by_id(self, source_id: int):
+        """
+        ソースIDからCDソースを直接取得
+        
+        Returns:
+            CDソース（Kind 3）、取得できない場合はNone
+        """
+        try:
+            source = self.app.GetITObjectByID(source_id, 0, 0, 0)
+            if source is not None:
+                # 事前バインディングでは IITObject として返るため Kind を読めるようにする
+                source = self.backend.cast(source, 'IITSource')
+            if source is not None and source.Kind == 3:
+                self.logger.info(f"通知されたCDソースを使用します: {source.Name}")
+                return source
+        except Exception as e:
+            self.logger.debug(f"ソースID {source_id} の取得に失敗: {e}")
+        return None
+    
+    def _find_cd_source(self):
+        """
+        ソース一覧からCDソースを探す
+        
+        Returns:
+            CDソース、見つからない場合はNone
+        """
+        sources = self.app.Sources
+        self.logger.debug(f"ソース数: {sources.Count}")
+        
+        cd_source = None
+        
+        # CDソースを検索（Kind 1または3がCDソース）
+        for i in range(1, sources.Count + 1):
+            try:
+                source = sources.Item(i)
+                source_kind = source.Kind
+                source_name = source.Name
+                self.logger.debug(f"ソース {i}: {source_name} (Kind: {source_kind})")
+                
+                # Kind 3は物理CD、Kind 1はライブラリ（CDが挿入されている場合も含む）
+                if source_kind == 3:
+                    # Kind 3は確実にCDソース
+                    cd_source = source
+                    self.logger.info(f"CDソースを検出しました（Kind 3）: {source_name}")
+                    break
+                elif source_kind == 1:
+                    # Kind 1の場合は、プレイリストを確認してCDかどうかを判定
+                    playlists = source.Playlists
+                    if playlists.Count > 0:
+                        # 「ライブラリ」以外のプレイリストを探す
+                        for j in range(1, min(playlists.Count + 1, 10)):  # 最初の10個まで確認
+                            try:
+                                playlist = playlists.Item(j)
+                                playlist_name = playlist.Name
+                                
+                                # ライブラリではなく、トラックがあるプレイリストならCDと判断
+                                if playlist_name != "ライブラリ" and playlist.Tracks.Count > 0:
+                                    cd_source = source
+                                    self.logger.info(f"CDソースを検出しました（Kind 1）: {source_name} (プレイリスト: {playlist_name})")
+                                    break
+                            except:
+                                continue
+                        
+                        if cd_source:
+                            break
+            except Exception as e:
+                self.logger.debug(f"ソース {i} 情報取得エラー: {e}")
+                continue
+        
+        return cd_source
+    
+    @_on_com_thread
+    def get_cd_info(self, source_id: Optional[int] = None) -> Optional[CDInfo]:
         """
         CD情報を取得
         
+        Args:
+            source_id: CDソースのID（CD挿入イベントで通知された場合）。
+                       指定時はソース一覧を走査せずに直接取得する
+        
         Returns:
             CD情報、取得失敗時はNone
         """
-        # COMオブジェクトを取得（既に起動している場合も含む）
-        if not self.app:
+        # COMオブジェクトを取得（既に起動している場合も含む。接続済みなら使い回す）
+        if not self._is_connected():
             # まずプロセスで起動状態を確認
             process_running = self._check_process_running()
             
@@ -289,49 +594,12 @@ class iTunesController:
         try:
             self.logger.debug("iTunes COMオブジェクトにアクセス中...")
             
-            # CDソースを取得
-            sources = self.app.Sources
-            self.logger.debug(f"ソース数: {sources.Count}")
-            
+            # CDソースを取得（イベントで通知されたソースがあれば直接取得）
             cd_source = None
-            
-            # CDソースを検索（Kind 1または3がCDソース）
-            for i in range(1, sources.Count + 1):
-                try:
-                    source = sources.Item(i)
-                    source_kind = source.Kind
-                    source_name = source.Name
-                    self.logger.debug(f"ソース {i}: {source_name} (Kind: {source_kind})")
-                    
-                    # Kind 3は物理CD、Kind 1はライブラリ（CDが挿入されている場合も含む）
-                    if source_kind == 3:
-                        # Kind 3は確実にCDソース
-                        cd_source = source
-                        self.logger.info(f"CDソースを検出しました（Kind 3）: {source_name}")
-                        break
-                    elif source_kind == 1:
-                        # Kind 1の場合は、プレイリストを確認してCDかどうかを判定
-                        playlists = source.Playlists
-                        if playlists.Count > 0:
-                            # 「ライブラリ」以外のプレイリストを探す
-                            for j in range(1, min(playlists.Count + 1, 10)):  # 最初の10個まで確認
-                                try:
-                                    playlist = playlists.Item(j)
-                                    playlist_name = playlist.Name
-                                    
-                                    # ライブラリではなく、トラックがあるプレイリストならCDと判断
-                                    if playlist_name != "ライブラリ" and playlist.Tracks.Count > 0:
-                                        cd_source = source
-                                        self.logger.info(f"CDソースを検出しました（Kind 1）: {source_name} (プレイリスト: {playlist_name})")
-                                        break
-                                except:
-                                    continue
-                            
-                            if cd_source:
-                                break
-                except Exception as e:
-                    self.logger.debug(f"ソース {i} 情報取得エラー: {e}")
-                    continue
+            if source_id is not None:
+                cd_source = self._get_source_by_id(source_id)
+            if not cd_source:
+                cd_source = self._find_cd_source()
             
             if not cd_source:
                 self.logger.warning("CDが検出されませんでした。CDが挿入されているか確認してください。")
@@ -341,9 +609,14 @@ class iTunesController:
             self.logger.info("CDソースの再読み込みを試みます...")
             self._refresh_cd_source(cd_source)
             
-            # CD認識待機
-            self.logger.info(f"CD認識待機中... ({self.cd_recognition_wait}秒)")
-            time.sleep(self.cd_recognition_wait)
+            # CD認識待機（トラックのあるプレイリストが見えた時点で終了）
+            self.logger.info(f"CD認識待機中... (最大{self.cd_recognition_wait}秒)")
+            started_at = time.monotonic()
+            if self._wait_until(
+                lambda: self._find_cd_playlist(cd_source) is not None,
+                self.cd_recognition_wait
+            ):
+                self.logger.debug(f"CDを認識しました（{time.monotonic() - started_at:.1f}秒）")
             
             # プレイリストを取得（最大2回試行）
             max_retries = 2
@@ -356,29 +629,17 @@ class iTunesController:
                 if playlists.Count == 0:
                     if retry < max_retries - 1:
                         self.logger.info("プレイリストが見つかりません。再試行します...")
-                        # 再度リフレッシュを試みる
+                        # 再度リフレッシュを試みる（リフレッシュ内で準備完了まで待機）
                         self._refresh_cd_source(cd_source)
-                        time.sleep(2)
                         continue
                     else:
                         self.logger.warning("CDプレイリストが見つかりませんでした。CDが正しく認識されていない可能性があります。")
                         return None
                 
-                # CDプレイリストを探す（「ライブラリ」以外のプレイリスト）
-                for i in range(1, playlists.Count + 1):
-                    try:
-                        playlist = playlists.Item(i)
-                        playlist_name = playlist.Name
-                        self.logger.debug(f"プレイリスト {i}: {playlist_name} (トラック数: {playlist.Tracks.Count})")
-                        
-                        # 「ライブラリ」以外で、トラックがあるプレイリストをCDと判断
-                        if playlist_name != "ライブラリ" and playlist.Tracks.Count > 0:
-                            cd_playlist = playlist
-                            self.logger.info(f"CDプレイリストを検出: {playlist_name}")
-                            break
-                    except Exception as e:
-                        self.logger.debug(f"プレイリスト {i} の取得に失敗: {e}")
-                        continue
+                # CDプレイリストを探す（「ライブラリ」以外でトラックがあるプレイリスト）
+                cd_playlist = self._find_cd_playlist(cd_source)
+                if cd_playlist:
+                    self.logger.info(f"CDプレイリストを検出: {cd_playlist.Name}")
                 
                 # CDプレイリストが見つかった場合はループを抜ける
                 if cd_playlist:
@@ -400,51 +661,10 @@ class iTunesController:
             
             # アルバム情報を取得
             album = cd_playlist.Name
-            artist = ""
-            genre = ""
-            year = ""
             
-            # トラック情報を取得
-            tracks = []
+            # トラック情報を一括取得
             try:
-                track_collection = cd_playlist.Tracks
-                track_count = track_collection.Count
-                self.logger.debug(f"トラック数: {track_count}")
-                
-                if track_count == 0:
-                    self.logger.warning("トラックが0件です")
-                    return None
-                
-                # COMコレクションは1から始まるインデックスを使用
-                for idx in range(1, track_count + 1):
-                    try:
-                        track_obj = track_collection.Item(idx)
-                        track_name = track_obj.Name or f"Track {idx}"
-                        track_artist = track_obj.Artist or ""
-                        track_duration = track_obj.Duration or 0
-                        
-                        self.logger.debug(f"トラック{idx}: {track_name} - {track_artist} ({track_duration}秒)")
-                        
-                        if not artist and track_artist:
-                            artist = track_artist
-                        if not genre and hasattr(track_obj, 'Genre') and track_obj.Genre:
-                            genre = track_obj.Genre
-                        if not year and hasattr(track_obj, 'Year') and track_obj.Year:
-                            year = str(track_obj.Year)
-                        
-                        track = Track(
-                            number=idx,
-                            title=track_name,
-                            title_en=track_name,
-                            artist=track_artist or artist,
-                            duration=int(float(track_duration))
-                        )
-                        tracks.append(track)
-                    except Exception as e:
-                        self.logger.warning(f"トラック{idx}の取得に失敗: {e}")
-                        import traceback
-                        self.logger.debug(traceback.format_exc())
-                        continue
+                tracks, artist, genre, year = self._extract_tracks(cd_playlist.Tracks)
             except Exception as e:
                 self.logger.error(f"トラックコレクションの取得に失敗: {e}")
                 import traceback
@@ -476,3 +696,67 @@ class iTunesController:
             self.logger.error(traceback.format_exc())
             return None
 
+
+class _ComCallStats:
+    """COM呼び出しの回数と所要時間の集計"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.elapsed = 0.0
+    
+    def get(self, obj, name: str, *default):
+        """
+        プロパティを1回の呼び出しで取得
+        
+        Args:
+            obj: COMオブジェクト
+            name: プロパティ名
+            default: 取得できない場合の既定値（省略時は例外を送出）
+        """
+        self.calls += 1
+        started_at = time.perf_counter()
+        try:
+            return getattr(obj, name)
+        except Exception:
+            if default:
+                return default[0]
+            raise
+        finally:
+            self.elapsed += time.perf_counter() - started_at
+    
+    def iterate(self, collection, count: int) -> Iterator[object]:
+        """
+        コレクションの要素を列挙子（_NewEnum）で走査
+        
+        列挙子を取得できない場合は Item(1..count) で1件ずつ取得する。
+        """
+        self.calls += 1
+        started_at = time.perf_counter()
+        try:
+            enumerator = iter(collection)
+        except Exception:
+            enumerator = None
+        finally:
+            self.elapsed += time.perf_counter() - started_at
+        
+        if enumerator is None:
+            for idx in range(1, count + 1):
+                self.calls += 1
+                started_at = time.perf_counter()
+                try:
+                    item = collection.Item(idx)
+                finally:
+                    self.elapsed += time.perf_counter() - started_at
+                yield item
+            return
+        
+        while True:
+            self.calls += 1
+            started_at = time.perf_counter()
+            try:
+                item = next(enumerator)
+            except StopIteration:
+                return
+            finally:
+                self.elapsed += time.perf_counter() - started_at
+            yield item
@@ -0,0 +1,175 @@
+"""プロセス監視モジュール"""
+
+import os
+import subprocess
+import threading
+import time
+import logging
+from typing import Optional, Set
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import win32api
+    import win32con
+    import win32process
+    WIN32API_AVAILABLE = True
+except ImportError:
+    WIN32API_AVAILABLE = False
+
+
+class ProcessMonitor:
+    """
+    プロセスの起動状態を監視するクラス
+    
+    プロセス一覧はプロセス内のAPI（psutil → Win32 API → tasklist の順）で取得し、
+    結果を短時間キャッシュする。バックグラウンドの監視スレッドが一定間隔で
+    更新するため、is_running() は通常キャッシュを読むだけで済む。
+    """
+    
+    def __init__(self, image_name: str, ttl: float = 2.0, poll_interval: float = 2.0):
+        """
+        初期化
+        
+        Args:
+            image_name: 監視する実行ファイル名（例: iTunes.exe）
+            ttl: 判定結果のキャッシュ有効期間（秒）
+            poll_interval: 監視スレッドの更新間隔（秒）
+        """
+        self.image_name = image_name.lower()
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._running = False
+        self._checked_at: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def is_running(self) -> bool:
+        """
+        プロセスが実行中かどうか
+        
+        キャッシュが有効期間内であればそのまま返し、期限切れの場合のみ再取得する。
+        """
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._running
+        return self.refresh()
+    
+    def refresh(self) -> bool:
+        """
+        プロセス一覧を取得し直して判定結果を更新
+        
+        Returns:
+            プロセスが実行中かどうか
+        """
+        running = self._scan()
+        with self._lock:
+            changed = self._checked_at is not None and running != self._running
+            self._running = running
+            self._checked_at = time.monotonic()
+        
+        if changed:
+            self.logger.debug(f"{self.image_name}: {'起動' if running else '終了'}を検出しました")
+        return running
+    
+    def invalidate(self):
+        """キャッシュを破棄（プロセスの起動・終了直後などに使用）"""
+        with self._lock:
+            self._checked_at = None
+    
+    def start(self):
+        """監視スレッドを開始"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._watch_loop,
+            name=f"process-monitor-{self.image_name}",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """監視スレッドを停止"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+    
+    def _watch_loop(self):
+        """一定間隔で判定結果を更新"""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.debug(f"プロセス監視エラー: {e}")
+            self._stop_event.wait(self.poll_interval)
+    
+    def _scan(self) -> bool:
+        """利用可能な方法でプロセス一覧を調べる"""
+        if PSUTIL_AVAILABLE:
+            try:
+                return self.image_name in self._scan_psutil()
+            except Exception as e:
+                self.logger.debug(f"psutilでのプロセス取得に失敗: {e}")
+        
+        if WIN32API_AVAILABLE:
+            try:
+                return self.image_name in self._scan_win32()
+            except Exception as e:
+                self.logger.debug(f"Win32 APIでのプロセス取得に失敗: {e}")
+        
+        return self._scan_tasklist()
+    
+    @staticmethod
+    def _scan_psutil() -> Set[str]:
+        """psutilでプロセス名の一覧を取得"""
+        names = set()
+        for proc in psutil.process_iter(['name']):
+            name = proc.info.get('name')
+            if name:
+                names.add(name.lower())
+        return names
+    
+    @staticmethod
+    def _scan_win32() -> Set[str]:
+        """EnumProcessesでプロセス名の一覧を取得"""
+        names = set()
+        access = win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ
+        for pid in win32process.EnumProcesses():
+            if pid == 0:
+                continue
+            try:
+                handle = win32api.OpenProcess(access, False, pid)
+            except Exception:
+                # 権限のないプロセス（システムプロセス等）は無視
+                continue
+            try:
+                path = win32process.GetModuleFileNameEx(handle, None)
+                names.add(os.path.basename(path).lower())
+            except Exception:
+                continue
+            finally:
+                win32api.CloseHandle(handle)
+        return names
+    
+    def _scan_tasklist(self) -> bool:
+        """tasklistコマンドで検出（ネイティブAPIが使えない場合のフォールバック）"""
+        try:
+            result = subprocess.run(
+                ['tasklist', '/FI', f'IMAGENAME eq {self.image_name}', '/FO', 'CSV', '/NH'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            return result.returncode == 0 and self.image_name in result.stdout.lower()
+        except Exception as e:
+            self.logger.debug(f"プロセス検出エラー: {e}")
+            return False
@@ -0,0 +1,101 @@
+"""状態監視モジュール"""
+
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+
+class StatusMonitor:
+    """
+    iTunes/EAC等の状態をバックグラウンドで監視するクラス
+    
+    状態の判定関数（プローブ）を監視スレッドで一定間隔ごとに実行し、結果を
+    キャッシュする。状態が変化したときだけ on_change を呼ぶため、GUI側は
+    キャッシュを読むだけでよく、メインループを止めない。
+    """
+    
+    def __init__(self, probes: Dict[str, Callable[[], bool]],
+                 on_change: Optional[Callable[[Dict[str, bool]], None]] = None,
+                 interval: float = 1.0):
+        """
+        初期化
+        
+        Args:
+            probes: 状態名 -> 状態を判定する関数
+            on_change: 状態が変化したときに呼ばれるコールバック関数(状態辞書)
+                       ※監視スレッドから呼ばれる
+            interval: 監視間隔（秒）
+        """
+        self.probes = probes
+        self.on_change = on_change
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._state: Dict[str, bool] = {name: False for name in probes}
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def get_state(self) -> Dict[str, bool]:
+        """キャッシュ済みの状態を取得（ブロックしない）"""
+        with self._lock:
+            return dict(self._state)
+    
+    def get(self, name: str) -> bool:
+        """キャッシュ済みの状態を1つ取得"""
+        with self._lock:
+            return self._state.get(name, False)
+    
+    def refresh_now(self):
+        """次の監視間隔を待たずに状態を再確認させる"""
+        self._wake_event.set()
+    
+    def start(self):
+        """監視スレッドを開始"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch_loop, name='status-monitor', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """監視スレッドを停止"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+    
+    def poll(self) -> bool:
+        """
+        全プローブを実行して状態を更新
+        
+        Returns:
+            状態が変化したかどうか
+        """
+        new_state = {}
+        for name, probe in self.probes.items():
+            try:
+                new_state[name] = bool(probe())
+            except Exception as e:
+                self.logger.debug(f"状態確認エラー ({name}): {e}")
+                new_state[name] = self.get(name)
+        
+        with self._lock:
+            changed = new_state != self._state
+            self._state = new_state
+        
+        if changed and self.on_change:
+            try:
+                self.on_change(dict(new_state))
+            except Exception as e:
+                self.logger.debug(f"状態通知エラー: {e}")
+        return changed
+    
+    def _watch_loop(self):
+        """一定間隔（または refresh_now の要求時）に状態を更新"""
+        while not self._stop_event.is_set():
+            self.poll()
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
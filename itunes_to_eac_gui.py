@@ -12,6 +12,8 @@ from models.cd_info import CDInfo
 from models.track import Track
 from controllers.itunes_controller import iTunesController
 from controllers.eac_controller import EACController
+from controllers.status_monitor import StatusMonitor
+from controllers.cd_event_watcher import CDEventWatcher
 from generators.cdplayer_generator import CDPlayerGenerator
 from search.web_search_manager import WebSearchManager
 from utils.config_manager import ConfigManager
@@ -40,8 +42,10 @@ class iTunesToEACGUI:
         self.itunes_controller = iTunesController(
             itunes_path=self.config.get('Paths', 'itunes_path'),
             startup_wait=self.config.getint('Options', 'itunes_startup_wait', fallback=10),
-            cd_recognition_wait=self.config.getint('Options', 'cd_recognition_wait', fallback=5)
+            cd_recognition_wait=self.config.getint('Options', 'cd_recognition_wait', fallback=5),
+            process_check_interval=self.config.getint('Options', 'process_check_interval', fallback=2)
         )
+        self.itunes_controller.start_monitoring()
         
         self.eac_controller = EACController(
             eac_path=self.config.get('Paths', 'eac_path')
@@ -55,13 +59,23 @@ class iTunesToEACGUI:
         # Web検索マネージャー初期化
         search_config = {
             'use_wikipedia_ja': self.config.getboolean('WebSearch', 'use_wikipedia_ja', fallback=True),
+            'wikipedia_batch_fetch': self.config.getboolean('WebSearch', 'wikipedia_batch_fetch', fallback=True),
+            'wikipedia_html_parser': self.config.get('WebSearch', 'wikipedia_html_parser', fallback='auto'),
             'use_musicbrainz': self.config.getboolean('WebSearch', 'use_musicbrainz', fallback=True),
             'use_general_search': self.config.getboolean('WebSearch', 'use_general_search', fallback=False),
             'search_timeout': self.config.getint('WebSearch', 'search_timeout', fallback=30),
+            'source_timeout': self.config.getint('WebSearch', 'source_timeout', fallback=20),
+            'musicbrainz_rate_limit': self.config.getfloat('WebSearch', 'musicbrainz_rate_limit', fallback=1.0),
+            'musicbrainz_burst': self.config.getint('WebSearch', 'musicbrainz_burst', fallback=2),
             'max_candidates': self.config.getint('WebSearch', 'max_candidates', fallback=5),
+            'match_mode': self.config.get('SearchBehavior', 'match_mode', fallback='greedy'),
             'enable_cache': self.config.getboolean('Cache', 'enable_cache', fallback=True),
             'cache_dir': self.config.get('Cache', 'cache_dir', fallback='cache'),
-            'cache_expire_days': self.config.getint('Cache', 'cache_expire_days', fallback=30)
+            'cache_expire_days': self.config.getint('Cache', 'cache_expire_days', fallback=30),
+            'negative_cache_expire_days': self.config.getint('Cache', 'negative_cache_expire_days', fallback=1),
+            'max_cache_size_mb': self.config.getint('Cache', 'max_cache_size_mb', fallback=100),
+            'memory_cache_entries': self.config.getint('Cache', 'memory_cache_entries', fallback=256),
+            'memory_cache_size_mb': self.config.getint('Cache', 'memory_cache_size_mb', fallback=16)
         }
         self.web_search_manager = WebSearchManager(search_config)
         
@@ -76,6 +90,26 @@ class iTunesToEACGUI:
         self._create_menu()
         self._create_widgets()
         
+        # 状態監視（iTunes/EACの状態はバックグラウンドで確認し、変化時のみ画面に反映）
+        self.status_monitor = StatusMonitor(
+            probes={
+                'itunes': self.itunes_controller.is_running_cached,
+                'eac': self.eac_controller.is_running
+            },
+            on_change=lambda state: self.root.after(0, self.update_status),
+            interval=self.config.getint('GUI', 'status_refresh_interval', fallback=1)
+        )
+        self.status_monitor.start()
+        
+        # CD挿入イベント監視（挿入を検出したらCD情報取得と邦題検索を自動で開始）
+        self._cd_fetch_running = False
+        self.cd_event_watcher = CDEventWatcher(
+            on_cd_inserted=lambda source_id: self.root.after(0, self._on_cd_inserted, source_id),
+            is_itunes_running=self.itunes_controller.process_monitor.is_running
+        )
+        if self.config.getboolean('Options', 'auto_detect_cd', fallback=True):
+            self.cd_event_watcher.start()
+        
         # 状態更新
         self.update_status()
     
@@ -241,15 +275,20 @@ class iTunesToEACGUI:
         self.logger.addHandler(log_handler)
     
     def update_status(self):
-        """状態を更新"""
+        """状態を更新（iTunes/EACの状態は監視結果のキャッシュを表示）"""
+        state = self.status_monitor.get_state()
+        
+        # 状態が変わる操作の直後に呼ばれることが多いため、再確認を要求しておく
+        self.status_monitor.refresh_now()
+        
         # iTunes状態
-        if self.itunes_controller.is_running():
+        if state['itunes']:
             self.itunes_status_label.config(text="●起動中")
         else:
             self.itunes_status_label.config(text="○未起動")
         
         # EAC状態
-        if self.eac_controller.is_running():
+        if state['eac']:
             self.eac_status_label.config(text="●起動中")
         else:
             self.eac_status_label.config(text="○未起動")
@@ -312,12 +351,15 @@ class iTunesToEACGUI:
         threading.Thread(target=_start, daemon=True).start()
     
     def stop_itunes(self):
-        """iTunesを終了"""
-        if self.itunes_controller.stop():
-            self.logger.info("iTunes終了完了")
-            self.update_status()
-        else:
-            messagebox.showerror("エラー", "iTunesの終了に失敗しました")
+        """iTunesを終了（CD情報取得などのCOM処理の完了を待つため、画面を止めないよう別スレッドで実行）"""
+        def _stop():
+            if self.itunes_controller.stop():
+                self.logger.info("iTunes終了完了")
+                self.root.after(0, self.update_status)
+            else:
+                self.root.after(0, lambda: messagebox.showerror("エラー", "iTunesの終了に失敗しました"))
+        
+        threading.Thread(target=_stop, daemon=True).start()
     
     def start_eac(self):
         """EACを起動"""
@@ -335,9 +377,26 @@ class iTunesToEACGUI:
         else:
             messagebox.showerror("エラー", "EACの終了に失敗しました")
     
-    def get_cd_info(self):
-        """CD情報を取得"""
+    def get_cd_info(self, source_id: Optional[int] = None, auto_search: bool = False):
+        """
+        CD情報を取得
+        
+        Args:
+            source_id: CDソースのID（CD挿入イベントから呼ばれた場合）
+            auto_search: 取得後に邦題検索を自動で開始するか
+        """
+        if self._cd_fetch_running:
+            self.logger.info("CD情報取得は既に実行中です")
+            return
+        self._cd_fetch_running = True
+        
         def _get():
+            try:
+                _fetch()
+            finally:
+                self._cd_fetch_running = False
+        
+        def _fetch():
             self.progress_var.set(0)
             self.logger.info("CD情報取得を開始...")
             
@@ -345,7 +404,7 @@ class iTunesToEACGUI:
             if not self.itunes_controller.is_running():
                 self.logger.info("iTunesが起動していません。起動を試みます...")
             
-            cd_info = self.itunes_controller.get_cd_info()
+            cd_info = self.itunes_controller.get_cd_info(source_id=source_id)
             
             if cd_info:
                 self.cd_info = cd_info
@@ -353,6 +412,14 @@ class iTunesToEACGUI:
                 self.logger.info(f"CD情報取得完了: {cd_info.artist} - {cd_info.album}")
                 self.update_status()
                 self.progress_var.set(100)
+                
+                # 邦題化が必要なCDであれば続けて検索する
+                if auto_search and cd_info.detect_language() != 'ja':
+                    self.root.after(0, self.search_japanese_titles)
+            elif source_id is not None:
+                # 自動取得の失敗はダイアログを出さずログのみ
+                self.logger.warning("挿入されたCDの情報を取得できませんでした。手動で取得してください")
+                self.progress_var.set(0)
             else:
                 self.logger.error("CD情報の取得に失敗しました")
                 error_msg = (
@@ -368,6 +435,14 @@ class iTunesToEACGUI:
         
         threading.Thread(target=_get, daemon=True).start()
     
+    def _on_cd_inserted(self, source_id: int):
+        """CD挿入イベントの処理（CD情報取得と邦題検索を自動で開始）"""
+        self.logger.info("CDの挿入を検出しました。CD情報を自動取得します...")
+        self.get_cd_info(
+            source_id=source_id,
+            auto_search=self.config.getboolean('Options', 'auto_search_on_insert', fallback=True)
+        )
+    
     def search_japanese_titles(self):
         """日本語タイトルを検索"""
         if not self.cd_info:
@@ -381,11 +456,23 @@ class iTunesToEACGUI:
             def progress_callback(current, total):
                 self.progress_var.set((current / total) * 50)
             
-            # 検索実行
-            search_results = self.web_search_manager.search_titles(
+            # 検索実行（結果を取得するたびにマッチングしてトラックリストを更新）
+            search_results = []
+            
+            for result in self.web_search_manager.iter_search_titles(
                 self.cd_info,
                 progress_callback=progress_callback
-            )
+            ):
+                search_results.append(result)
+                self.logger.info(f"検索結果を取得: {result.album_title} ({result.source})")
+                
+                # マッチングと適用
+                self.cd_info = self.web_search_manager.apply_search_results(
+                    self.cd_info,
+                    search_results,
+                    auto_apply=False  # 手動確認モード
+                )
+                self.root.after(0, self.update_track_list)
             
             if not search_results:
                 self.logger.warning("検索結果が見つかりませんでした")
@@ -393,14 +480,6 @@ class iTunesToEACGUI:
                 self.progress_var.set(0)
                 return
             
-            # マッチングと適用
-            self.progress_var.set(50)
-            self.cd_info = self.web_search_manager.apply_search_results(
-                self.cd_info,
-                search_results,
-                auto_apply=False  # 手動確認モード
-            )
-            
             self.logger.info(f"邦題検索完了: {sum(1 for t in self.cd_info.tracks if t.title_ja)}/{len(self.cd_info.tracks)}件取得")
             self.update_status()
             self.progress_var.set(100)
@@ -530,10 +609,21 @@ class iTunesToEACGUI:
     
     def show_history(self):
         """履歴表示"""
+        page_size = 50
+        state = {'offset': 0}
+        
         history_window = tk.Toplevel(self.root)
         history_window.title("CD処理履歴")
         history_window.geometry("600x400")
         
+        # 検索バー
+        search_frame = ttk.Frame(history_window)
+        search_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Label(search_frame, text="検索:").pack(side=tk.LEFT)
+        query_var = tk.StringVar()
+        query_entry = ttk.Entry(search_frame, textvariable=query_var, width=30)
+        query_entry.pack(side=tk.LEFT, padx=5)
+        
         tree = ttk.Treeview(history_window, columns=('日時', 'アーティスト', 'アルバム', 'トラック数', 'ステータス'), show='headings')
         tree.heading('日時', text='日時')
         tree.heading('アーティスト', text='アーティスト')
@@ -541,16 +631,59 @@ class iTunesToEACGUI:
         tree.heading('トラック数', text='トラック数')
         tree.heading('ステータス', text='ステータス')
         
-        for entry in self.history.get_latest(50):
-            tree.insert('', 'end', values=(
-                entry.get('date', '')[:19],
-                entry.get('artist', ''),
-                entry.get('album', ''),
-                entry.get('tracks_count', 0),
-                entry.get('status', '')
-            ))
+        # ページ送り
+        page_frame = ttk.Frame(history_window)
+        page_label = ttk.Label(page_frame, text="")
+        
+        def load_page():
+            entries, total = self.history.query(
+                text=query_var.get().strip() or None,
+                offset=state['offset'],
+                limit=page_size
+            )
+            
+            tree.delete(*tree.get_children())
+            for entry in entries:
+                tree.insert('', 'end', values=(
+                    entry.get('date', '')[:19],
+                    entry.get('artist', ''),
+                    entry.get('album', ''),
+                    entry.get('tracks_count', 0),
+                    entry.get('status', '')
+                ))
+            
+            if total:
+                page_label.config(
+                    text=f"{state['offset'] + 1}-{state['offset'] + len(entries)} / {total}件"
+                )
+            else:
+                page_label.config(text="0件")
+            prev_button.config(state=tk.NORMAL if state['offset'] > 0 else tk.DISABLED)
+            next_button.config(
+                state=tk.NORMAL if state['offset'] + page_size < total else tk.DISABLED
+            )
+        
+        def search(event=None):
+            state['offset'] = 0
+            load_page()
+        
+        def move(delta):
+            state['offset'] = max(0, state['offset'] + delta)
+            load_page()
+        
+        ttk.Button(search_frame, text="検索", command=search).pack(side=tk.LEFT)
+        query_entry.bind("<Return>", search)
+        
+        prev_button = ttk.Button(page_frame, text="< 前へ", command=lambda: move(-page_size))
+        next_button = ttk.Button(page_frame, text="次へ >", command=lambda: move(page_size))
+        prev_button.pack(side=tk.LEFT)
+        page_label.pack(side=tk.LEFT, padx=10)
+        next_button.pack(side=tk.LEFT)
         
         tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        page_frame.pack(pady=(0, 10))
+        
+        load_page()
     
     def clear_cache(self):
         """キャッシュをクリア"""
@@ -621,6 +754,12 @@ class iTunesToEACGUI:
     def on_closing(self):
         """アプリケーション終了"""
         if messagebox.askokcancel("終了", "アプリケーションを終了しますか？"):
+            self.status_monitor.stop()
+            self.cd_event_watcher.stop()
+            self.itunes_controller.close()
+            # 未反映の最終アクセス日時を書き出してからデータベースを閉じる
+            self.web_search_manager.cache.close()
+            self.history.close()
             self.root.destroy()
     
     def run(self):
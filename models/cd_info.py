@@ -25,6 +25,7 @@ class CDInfo:
     language: str = "en"  # 'en', 'ja', 'mixed'
     search_performed: bool = False
     search_timestamp: Optional[str] = None
+    toc: Optional[str] = None  # CDの目次（"先頭 最終 リードアウト オフセット..."、取得できた場合のみ）
     
     def __post_init__(self):
         """初期化後処理"""
@@ -69,6 +70,7 @@ class CDInfo:
             'num_tracks': self.num_tracks,
             'language': self.language,
             'search_performed': self.search_performed,
+            'toc': self.toc,
             'tracks': [track.to_dict() for track in self.tracks]
         }
     
@@ -84,6 +86,7 @@ class CDInfo:
             num_tracks=data.get('num_tracks', 0),
             tracks=tracks,
             language=data.get('language', 'en'),
-            search_performed=data.get('search_performed', False)
+            search_performed=data.get('search_performed', False),
+            toc=data.get('toc')
         )
 
@@ -5,7 +5,9 @@ from .wikipedia_searcher import WikipediaSearcher
 from .musicbrainz_searcher import MusicBrainzSearcher
 from .matcher import TrackMatcher
 from .confidence_scorer import ConfidenceScorer
-from .cache_manager import CacheManager
+from .cache_manager import CacheManager, MemoryCache
+from .rate_limiter import TokenBucket
+from .html_extractors import HtmlExtractor, create_extractor
 
 __all__ = [
     'WebSearchManager',
@@ -13,5 +15,9 @@ __all__ = [
     'MusicBrainzSearcher',
     'TrackMatcher',
     'ConfidenceScorer',
-    'CacheManager'
+    'CacheManager',
+    'MemoryCache',
+    'TokenBucket',
+    'HtmlExtractor',
+    'create_extractor'
 ]
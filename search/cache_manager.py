@@ -1,34 +1,215 @@
 """キャッシュ管理モジュール"""
 
 import json
-import hashlib
+import sqlite3
 import logging
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+
+class MemoryCache:
+    """検索結果のメモリキャッシュ（件数・バイト数上限付きLRU）"""
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        """
+        初期化
+        
+        Args:
+            max_entries: 最大件数、0以下で無効
+            max_bytes: 最大バイト数（JSON換算）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[datetime, List[Dict], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Tuple[datetime, List[Dict]]]:
+        """
+        エントリ取得
+        
+        Returns:
+            (検索日時, 検索結果)、存在しない場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+    
+    def put(self, key: str, search_date: datetime, results: List[Dict], size: int):
+        """エントリ追加（上限を超えた分は古い順に破棄）"""
+        if self.max_entries <= 0 or size > self.max_bytes:
+            self.discard(key)
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            
+            self._entries[key] = (search_date, results, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+    
+    def discard(self, key: str):
+        """エントリ削除"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+    
+    def clear(self):
+        """全エントリ削除"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def get_stats(self) -> Dict:
+        """ヒット率などの統計情報"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
 
 
 class CacheManager:
-    """検索結果キャッシュ管理クラス"""
+    """検索結果キャッシュ管理クラス（SQLite）"""
+    
+    DB_NAME = 'search_cache.db'
+    LEGACY_DIR_NAME = 'search_results'
+    
+    # 期限切れエントリを削除する間隔（秒）
+    PURGE_INTERVAL = 3600
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS search_cache (
+            cache_key   TEXT PRIMARY KEY,
+            artist      TEXT NOT NULL,
+            album       TEXT NOT NULL,
+            search_date TEXT NOT NULL,
+            results     TEXT NOT NULL,
+            size        INTEGER NOT NULL,
+            last_access REAL NOT NULL DEFAULT 0
+        );
+        
+        CREATE TABLE IF NOT EXISTS cache_stats (
+            id         INTEGER PRIMARY KEY CHECK (id = 0),
+            total_size INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO cache_stats (id, total_size) VALUES (0, 0);
+        
+        CREATE TRIGGER IF NOT EXISTS search_cache_insert AFTER INSERT ON search_cache
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size + NEW.size WHERE id = 0;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS search_cache_update AFTER UPDATE OF size ON search_cache
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size - OLD.size + NEW.size WHERE id = 0;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS search_cache_delete AFTER DELETE ON search_cache
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size - OLD.size WHERE id = 0;
+        END;
+        
+        CREATE TABLE IF NOT EXISTS wikipedia_pages (
+            page_id     INTEGER PRIMARY KEY,
+            revid       INTEGER NOT NULL,
+            tracks      TEXT NOT NULL,
+            size        INTEGER NOT NULL DEFAULT 0,
+            last_access REAL NOT NULL
+        );
+        
+        CREATE TRIGGER IF NOT EXISTS wikipedia_pages_insert AFTER INSERT ON wikipedia_pages
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size + NEW.size WHERE id = 0;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS wikipedia_pages_update AFTER UPDATE OF size ON wikipedia_pages
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size - OLD.size + NEW.size WHERE id = 0;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS wikipedia_pages_delete AFTER DELETE ON wikipedia_pages
+        BEGIN
+            UPDATE cache_stats SET total_size = total_size - OLD.size WHERE id = 0;
+        END;
+    """
     
-    def __init__(self, cache_dir: str = 'cache', expire_days: int = 30):
+    def __init__(self, cache_dir: str = 'cache', expire_days: int = 30,
+                 negative_expire_days: float = 1,
+                 max_size_mb: float = 100, memory_entries: int = 256,
+                 memory_size_mb: float = 16):
         """
         初期化
         
         Args:
             cache_dir: キャッシュディレクトリ
             expire_days: 有効期限（日）
+            negative_expire_days: 検索結果なしの有効期限（日）
+            max_size_mb: 最大キャッシュサイズ（MB）、0以下で無制限
+            memory_entries: メモリキャッシュの最大件数、0以下で無効
+            memory_size_mb: メモリキャッシュの最大サイズ（MB）
         """
-        self.cache_dir = Path(cache_dir) / 'search_results'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_root = Path(cache_dir)
+        self.cache_root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_root / self.DB_NAME
         self.expire_days = expire_days
+        self.negative_expire_days = negative_expire_days
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
         self.logger = logging.getLogger(__name__)
+        
+        # ディスクの手前に置くメモリキャッシュ
+        self.memory = MemoryCache(
+            max_entries=memory_entries,
+            max_bytes=int(memory_size_mb * 1024 * 1024)
+        )
+        # メモリキャッシュでヒットしたキーの最終アクセス時刻（まとめてディスクへ反映）
+        self._pending_access: Dict[str, float] = {}
+        
+        # 検索スレッドとGUIスレッドの双方から使うため、接続は1本をロックで共有する
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+        self._upgrade_schema()
+        self._conn.commit()
+        
+        self._migrate_json_files()
+        
+        # 期限切れエントリの定期削除
+        self._stop_event = threading.Event()
+        self._purge_thread = threading.Thread(
+            target=self._purge_loop,
+            name='cache-purge',
+            daemon=True
+        )
+        self._purge_thread.start()
     
     def get_cache_key(self, artist: str, album: str) -> str:
-        """キャッシュキー生成"""
-        key_str = f"{artist.lower()}_{album.lower()}"
-        hash_str = hashlib.md5(key_str.encode()).hexdigest()[:8]
-        return f"{artist}_{album}_{hash_str}.json"
+        """キャッシュキー生成（正規化した検索クエリ）"""
+        return f"{' '.join(artist.lower().split())}_{' '.join(album.lower().split())}"
     
     def get(self, artist: str, album: str) -> Optional[List[Dict]]:
         """
@@ -40,30 +221,63 @@ class CacheManager:
         
         Returns:
             キャッシュされた検索結果、存在しない場合はNone
+            （「該当なし」がキャッシュされている場合は空リスト。
+            メモリキャッシュと要素を共有するため、要素は変更しないこと）
         """
-        cache_file = self.cache_dir / self.get_cache_key(artist, album)
+        cache_key = self.get_cache_key(artist, album)
         
-        if not cache_file.exists():
-            return None
+        # メモリキャッシュ
+        entry = self.memory.get(cache_key)
+        if entry is not None:
+            search_date, results = entry
+            if not self._is_expired(search_date, negative=not results):
+                with self._lock:
+                    self._pending_access[cache_key] = time.time()
+                return list(results)
+            self.memory.discard(cache_key)
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 有効期限チェック
-            search_date_str = data.get('query', {}).get('search_date')
-            if search_date_str:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT search_date, results FROM search_cache WHERE cache_key = ?',
+                    (cache_key,)
+                ).fetchone()
+                
+                if row is None:
+                    return None
+                
+                search_date_str, results_json = row
+                
+                # 有効期限チェック
                 search_date = datetime.fromisoformat(search_date_str)
-                if datetime.now() - search_date > timedelta(days=self.expire_days):
+                if self._is_expired(search_date, negative=results_json == '[]'):
                     self.logger.info("キャッシュが期限切れです")
+                    with self._conn:
+                        self._conn.execute(
+                            'DELETE FROM search_cache WHERE cache_key = ?', (cache_key,)
+                        )
                     return None
+                
+                # LRU用に最終アクセス時刻を更新
+                with self._conn:
+                    self._conn.execute(
+                        'UPDATE search_cache SET last_access = ? WHERE cache_key = ?',
+                        (time.time(), cache_key)
+                    )
             
-            return data.get('results', [])
+            results = json.loads(results_json)
+            self.memory.put(cache_key, search_date, results, len(results_json.encode('utf-8')))
+            return list(results)
         
         except Exception as e:
             self.logger.error(f"キャッシュ読み込みエラー: {e}")
             return None
     
+    def _is_expired(self, search_date: datetime, negative: bool = False) -> bool:
+        """有効期限切れかどうか（検索結果なしは短い有効期限を使う）"""
+        expire_days = self.negative_expire_days if negative else self.expire_days
+        return datetime.now() - search_date > timedelta(days=expire_days)
+    
     def set(self, artist: str, album: str, results: List[Dict]):
         """
         キャッシュ保存
@@ -71,38 +285,234 @@ class CacheManager:
         Args:
             artist: アーティスト名
             album: アルバム名
-            results: 検索結果
+            results: 検索結果（空リストは「該当なし」として短期間キャッシュ）
         """
-        cache_file = self.cache_dir / self.get_cache_key(artist, album)
+        # メモリキャッシュは次回のディスク読み込みで作り直す
+        self.memory.discard(self.get_cache_key(artist, album))
         
         try:
-            data = {
-                'query': {
-                    'artist': artist,
-                    'album': album,
-                    'search_date': datetime.now().isoformat()
-                },
-                'results': results,
-                'cache_version': '2.0'
-            }
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"キャッシュを保存しました: {cache_file.name}")
+            self._store(artist, album, results, datetime.now().isoformat())
+            self.logger.info(f"キャッシュを保存しました: {artist} - {album}")
+            self.evict()
         
         except Exception as e:
             self.logger.error(f"キャッシュ保存エラー: {e}")
     
+    def _store(self, artist: str, album: str, results: List[Dict], search_date: str):
+        """1件をキャッシュに書き込む（同じキーは上書き）"""
+        results_json = json.dumps(results, ensure_ascii=False, separators=(',', ':'))
+        size = len(results_json.encode('utf-8'))
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO search_cache
+                    (cache_key, artist, album, search_date, results, size, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    artist = excluded.artist,
+                    album = excluded.album,
+                    search_date = excluded.search_date,
+                    results = excluded.results,
+                    size = excluded.size,
+                    last_access = excluded.last_access
+                """,
+                (self.get_cache_key(artist, album), artist, album, search_date,
+                 results_json, size, time.time())
+            )
+    
+    def get_pages(self, page_ids: List[int]) -> Dict[int, Tuple[int, List[Dict]]]:
+        """
+        Wikipediaページのトラックリストを取得
+        
+        検索結果のキャッシュとは異なり有効期限はなく、呼び出し元がリビジョンIDを
+        比較して有効かどうかを判断する。
+        
+        Args:
+            page_ids: ページID
+        
+        Returns:
+            ページID -> (リビジョンID, トラックリスト)、キャッシュにないページは含まない
+        """
+        if not page_ids:
+            return {}
+        
+        placeholders = ','.join('?' * len(page_ids))
+        try:
+            with self._lock, self._conn:
+                rows = self._conn.execute(
+                    f'SELECT page_id, revid, tracks FROM wikipedia_pages WHERE page_id IN ({placeholders})',
+                    list(page_ids)
+                ).fetchall()
+                self._conn.execute(
+                    f'UPDATE wikipedia_pages SET last_access = ? WHERE page_id IN ({placeholders})',
+                    [time.time(), *page_ids]
+                )
+            return {page_id: (revid, json.loads(tracks)) for page_id, revid, tracks in rows}
+        
+        except Exception as e:
+            self.logger.error(f"キャッシュ読み込みエラー: {e}")
+            return {}
+    
+    def set_page(self, page_id: int, revid: int, tracks: List[Dict]):
+        """
+        Wikipediaページのトラックリストを保存
+        
+        Args:
+            page_id: ページID
+            revid: 抽出元のリビジョンID
+            tracks: 抽出したトラックリスト（空リストは「トラックリストなし」）
+        """
+        tracks_json = json.dumps(tracks, ensure_ascii=False, separators=(',', ':'))
+        size = len(tracks_json.encode('utf-8'))
+        
+        try:
+            # INSERT OR REPLACE は削除トリガーが動かずサイズの集計がずれるため UPSERT を使う
+            with self._lock, self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO wikipedia_pages (page_id, revid, tracks, size, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(page_id) DO UPDATE SET
+                        revid = excluded.revid,
+                        tracks = excluded.tracks,
+                        size = excluded.size,
+                        last_access = excluded.last_access
+                    """,
+                    (page_id, revid, tracks_json, size, time.time())
+                )
+            self.evict()
+        except Exception as e:
+            self.logger.error(f"キャッシュ保存エラー: {e}")
+    
     def clear_all(self):
         """全キャッシュ削除"""
+        self.memory.clear()
+        
         try:
-            for cache_file in self.cache_dir.glob('*.json'):
-                cache_file.unlink()
+            with self._lock, self._conn:
+                self._pending_access.clear()
+                self._conn.execute('DELETE FROM search_cache')
+                self._conn.execute('DELETE FROM wikipedia_pages')
             self.logger.info("全キャッシュを削除しました")
         except Exception as e:
             self.logger.error(f"キャッシュ削除エラー: {e}")
     
+    def evict(self) -> int:
+        """
+        最大キャッシュサイズを超えた分を、最終アクセスが古い順に削除
+        
+        検索結果とWikipediaページのトラックリストをまとめて古い順に削除する。
+        
+        Returns:
+            削除した件数
+        """
+        self.flush_access_times()
+        
+        if self.max_size_bytes <= 0:
+            return 0
+        
+        try:
+            with self._lock, self._conn:
+                total_size = self._total_size()
+                if total_size <= self.max_size_bytes:
+                    return 0
+                
+                victims = []
+                page_victims = []
+                cursor = self._conn.execute(
+                    """
+                    SELECT 0, cache_key, size, last_access FROM search_cache
+                    UNION ALL
+                    SELECT 1, page_id, size, last_access FROM wikipedia_pages
+                    ORDER BY last_access
+                    """
+                )
+                for is_page, key, size, _ in cursor:
+                    if total_size <= self.max_size_bytes:
+                        break
+                    (page_victims if is_page else victims).append((key,))
+                    total_size -= size
+                
+                self._conn.executemany(
+                    'DELETE FROM search_cache WHERE cache_key = ?', victims
+                )
+                self._conn.executemany(
+                    'DELETE FROM wikipedia_pages WHERE page_id = ?', page_victims
+                )
+            
+            evicted = len(victims) + len(page_victims)
+            self.logger.info(f"キャッシュサイズ上限により{evicted}件を削除しました")
+            return evicted
+        
+        except Exception as e:
+            self.logger.error(f"キャッシュ削除エラー: {e}")
+            return 0
+    
+    def flush_access_times(self):
+        """メモリキャッシュでのヒットをディスクの最終アクセス時刻に反映"""
+        try:
+            with self._lock, self._conn:
+                if not self._pending_access:
+                    return
+                self._conn.executemany(
+                    'UPDATE search_cache SET last_access = ? WHERE cache_key = ?',
+                    [(accessed, key) for key, accessed in self._pending_access.items()]
+                )
+                self._pending_access.clear()
+        except Exception as e:
+            self.logger.error(f"キャッシュ更新エラー: {e}")
+    
+    def get_memory_stats(self) -> Dict:
+        """
+        メモリキャッシュの統計情報を取得
+        
+        Returns:
+            {'hits', 'misses', 'hit_rate', 'entries', 'bytes'}
+        """
+        return self.memory.get_stats()
+    
+    def purge_expired(self) -> int:
+        """
+        期限切れエントリを削除
+        
+        Returns:
+            削除した件数
+        """
+        now = datetime.now()
+        cutoff = (now - timedelta(days=self.expire_days)).isoformat()
+        negative_cutoff = (now - timedelta(days=self.negative_expire_days)).isoformat()
+        
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(
+                    """
+                    DELETE FROM search_cache
+                    WHERE search_date < ? OR (results = '[]' AND search_date < ?)
+                    """,
+                    (cutoff, negative_cutoff)
+                )
+                # 期限の間に一度も使われなかったWikipediaページ
+                self._conn.execute(
+                    'DELETE FROM wikipedia_pages WHERE last_access < ?',
+                    (time.time() - self.expire_days * 86400,)
+                )
+            if cursor.rowcount:
+                self.logger.info(f"期限切れキャッシュを{cursor.rowcount}件削除しました")
+            return cursor.rowcount
+        
+        except Exception as e:
+            self.logger.error(f"キャッシュ削除エラー: {e}")
+            return 0
+    
+    def _purge_loop(self):
+        """期限切れエントリとサイズ超過分を定期的に削除する（バックグラウンド）"""
+        while True:
+            self.purge_expired()
+            self.evict()
+            if self._stop_event.wait(self.PURGE_INTERVAL):
+                break
+    
     def get_cache_size(self) -> float:
         """
         キャッシュサイズ取得（MB）
@@ -110,8 +520,81 @@ class CacheManager:
         Returns:
             キャッシュサイズ（MB）
         """
-        total_size = 0
-        for cache_file in self.cache_dir.glob('*.json'):
-            total_size += cache_file.stat().st_size
+        with self._lock:
+            total_size = self._total_size()
         return total_size / (1024 * 1024)  # MB単位
-
+    
+    def _total_size(self) -> int:
+        """キャッシュの合計バイト数（ロック取得済みで呼ぶこと）"""
+        row = self._conn.execute(
+            'SELECT total_size FROM cache_stats WHERE id = 0'
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def close(self):
+        """データベース接続を閉じる"""
+        self._stop_event.set()
+        self.flush_access_times()
+        with self._lock:
+            self._conn.close()
+    
+    def _upgrade_schema(self):
+        """旧バージョンで作成したデータベースに不足している列・索引を追加"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(search_cache)')}
+        if 'last_access' not in columns:
+            self._conn.execute(
+                'ALTER TABLE search_cache ADD COLUMN last_access REAL NOT NULL DEFAULT 0'
+            )
+        
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache (last_access)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_search_cache_search_date ON search_cache (search_date)'
+        )
+        
+        # サイズ集計前に作成した wikipedia_pages（集計トリガーで合計に加算される）
+        page_columns = {row[1] for row in self._conn.execute('PRAGMA table_info(wikipedia_pages)')}
+        if 'size' not in page_columns:
+            self._conn.execute(
+                'ALTER TABLE wikipedia_pages ADD COLUMN size INTEGER NOT NULL DEFAULT 0'
+            )
+            self._conn.execute(
+                'UPDATE wikipedia_pages SET size = length(CAST(tracks AS BLOB))'
+            )
+        
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_wikipedia_pages_last_access ON wikipedia_pages (last_access)'
+        )
+    
+    def _migrate_json_files(self):
+        """旧形式（1アルバム1JSONファイル）のキャッシュを取り込んで削除する"""
+        legacy_dir = self.cache_root / self.LEGACY_DIR_NAME
+        if not legacy_dir.is_dir():
+            return
+        
+        migrated = 0
+        for cache_file in legacy_dir.glob('*.json'):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                
+                query = data.get('query', {})
+                self._store(
+                    query.get('artist', ''),
+                    query.get('album', ''),
+                    data.get('results', []),
+                    query.get('search_date') or datetime.now().isoformat()
+                )
+                cache_file.unlink()
+                migrated += 1
+            except Exception as e:
+                self.logger.warning(f"旧キャッシュの移行に失敗: {cache_file.name}: {e}")
+        
+        try:
+            legacy_dir.rmdir()
+        except OSError:
+            pass  # 移行できなかったファイルが残っている
+        
+        if migrated:
+            self.logger.info(f"旧キャッシュを移行しました: {migrated}件")
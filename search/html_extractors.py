@@ -0,0 +1,253 @@
+"""HTMLからのトラックリスト抽出エンジン
+
+WikipediaSearcher がページHTMLから収録曲の<ol>リスト、またはトラックリストの
+表（table.tracklist）を取り出す処理を差し替え可能にする。どのエンジンも同じ
+文字列（BeautifulSoup の get_text(strip=True) 相当）を返す。
+
+- LxmlExtractor: lxml（C実装のlibxml2）で解析する（lxmlがある場合の既定）
+- StrainedSoupExtractor: SoupStrainer で<ol>・表・見出しの部分木だけを組み立てる
+- SoupExtractor: ページ全体のツリーを html.parser で組み立てる（従来の実装）
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# 収録曲セクションの見出し
+TRACKLIST_HEADING = re.compile(r'収録曲|トラック.*リスト')
+
+# 収録曲の見出しになりうる要素（旧形式: span.mw-headline、新形式: 見出し要素そのもの）
+HEADING_TAGS = ('span', 'h2', 'h3', 'h4')
+
+# get_text で対象外になる文字列を持つ要素
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+class HtmlExtractor:
+    """
+    トラックリスト抽出エンジンの基底クラス
+    
+    parse() で解析したドキュメントに対して list_items() / table_rows() を呼ぶ。
+    表は<ol>から抽出できなかった場合にのみ参照されるため、別メソッドにしている。
+    """
+    
+    name = ''
+    
+    def is_available(self) -> bool:
+        """エンジンが利用可能かチェック"""
+        return True
+    
+    def parse(self, html_content: str) -> Any:
+        """
+        HTMLを解析
+        
+        Args:
+            html_content: ページまたはセクションのHTML
+        
+        Returns:
+            エンジン固有のドキュメント
+        """
+        raise NotImplementedError
+    
+    def list_items(self, document: Any, in_section: bool = False) -> List[str]:
+        """
+        収録曲の<ol>リストの各項目のテキストを取得
+        
+        Args:
+            document: parse() の戻り値
+            in_section: 収録曲セクションのみのHTMLかどうか（最初の<ol>を対象にする）
+        
+        Returns:
+            項目のテキスト（<ol>がない場合は空リスト）
+        """
+        raise NotImplementedError
+    
+    def table_rows(self, document: Any) -> List[List[str]]:
+        """
+        トラックリストの表の各行（ヘッダー行を除く）のセルのテキストを取得
+        
+        Args:
+            document: parse() の戻り値
+        
+        Returns:
+            行ごとの<td>のテキスト（表がない場合は空リスト）
+        """
+        raise NotImplementedError
+
+
+class SoupExtractor(HtmlExtractor):
+    """ページ全体のツリーを html.parser で組み立てるエンジン"""
+    
+    name = 'soup'
+    
+    def parse(self, html_content: str) -> BeautifulSoup:
+        return BeautifulSoup(html_content, 'html.parser')
+    
+    def list_items(self, document: BeautifulSoup, in_section: bool = False) -> List[str]:
+        if in_section:
+            # セクション単体のHTMLには収録曲の見出ししかない
+            ol = document.find('ol')
+        else:
+            # "収録曲" セクションを探す
+            section = document.find(HEADING_TAGS, id=TRACKLIST_HEADING)
+            
+            if not section:
+                return []
+            
+            ol = section.find_next('ol')
+        
+        if not ol:
+            return []
+        
+        return [li.get_text(strip=True) for li in ol.find_all('li')]
+    
+    def table_rows(self, document: BeautifulSoup) -> List[List[str]]:
+        table = document.find('table', class_='tracklist')
+        
+        if not table:
+            return []
+        
+        return [
+            [td.get_text(strip=True) for td in row.find_all('td')]
+            for row in table.find_all('tr')[1:]  # ヘッダー行スキップ
+        ]
+
+
+class StrainedSoupExtractor(SoupExtractor):
+    """
+    必要な部分木だけを組み立てるエンジン
+    
+    SoupStrainer で<ol>・<table>・見出しになりうる要素だけをツリーにするため、
+    本文の段落やリンクなどのノードを作らずに済む。要素の出現順は保たれるので、
+    見出しの後の最初の<ol>を探す処理は SoupExtractor と同じ結果になる。
+    """
+    
+    name = 'strainer'
+    
+    def __init__(self):
+        self._strainer = SoupStrainer(['ol', 'table', *HEADING_TAGS])
+    
+    def parse(self, html_content: str) -> BeautifulSoup:
+        return BeautifulSoup(html_content, 'html.parser', parse_only=self._strainer)
+
+
+class LxmlExtractor(HtmlExtractor):
+    """lxml（libxml2）で解析するエンジン"""
+    
+    name = 'lxml'
+    
+    def is_available(self) -> bool:
+        return LXML_AVAILABLE
+    
+    def parse(self, html_content: str) -> Optional[Any]:
+        if not html_content.strip():
+            return None
+        return lxml.html.document_fromstring(html_content)
+    
+    def list_items(self, document: Optional[Any], in_section: bool = False) -> List[str]:
+        if document is None:
+            return []
+        
+        if in_section:
+            ol = next(document.iter('ol'), None)
+        else:
+            section = next(
+                (el for el in document.iter(*HEADING_TAGS)
+                 if TRACKLIST_HEADING.search(el.get('id') or '')),
+                None
+            )
+            
+            if section is None:
+                return []
+            
+            # find_next('ol') と同じく、子孫も含めて文書順で次の<ol>
+            found = section.xpath('(descendant::ol | following::ol)[1]')
+            ol = found[0] if found else None
+        
+        if ol is None:
+            return []
+        
+        return [_get_text(li) for li in ol.iter('li')]
+    
+    def table_rows(self, document: Optional[Any]) -> List[List[str]]:
+        if document is None:
+            return []
+        
+        table = next(
+            (el for el in document.iter('table')
+             if 'tracklist' in (el.get('class') or '').split()),
+            None
+        )
+        
+        if table is None:
+            return []
+        
+        return [
+            [_get_text(td) for td in row.iter('td')]
+            for row in list(table.iter('tr'))[1:]  # ヘッダー行スキップ
+        ]
+
+
+# 自動選択時の優先順
+EXTRACTORS: Dict[str, Type[HtmlExtractor]] = {
+    LxmlExtractor.name: LxmlExtractor,
+    StrainedSoupExtractor.name: StrainedSoupExtractor,
+    SoupExtractor.name: SoupExtractor,
+}
+
+
+def create_extractor(engine: str = 'auto') -> HtmlExtractor:
+    """
+    抽出エンジンを作成
+    
+    Args:
+        engine: エンジン名（auto / lxml / strainer / soup）、autoは利用可能な中で最速のもの
+    
+    Returns:
+        抽出エンジン
+    """
+    logger = logging.getLogger(__name__)
+    
+    if engine != 'auto':
+        extractor_class = EXTRACTORS.get(engine)
+        if extractor_class is None:
+            logger.warning(f"不明なHTMLパーサーのため自動選択します: {engine}")
+        else:
+            extractor = extractor_class()
+            if extractor.is_available():
+                return extractor
+            logger.warning(f"HTMLパーサーが利用できないため自動選択します: {engine}")
+    
+    for extractor_class in EXTRACTORS.values():
+        extractor = extractor_class()
+        if extractor.is_available():
+            logger.debug(f"HTMLパーサー: {extractor.name}")
+            return extractor
+    
+    return SoupExtractor()
+
+
+def _get_text(element: Any) -> str:
+    """lxml要素の get_text(strip=True) 相当（コメントやscript内の文字列は含めない）"""
+    parts: List[str] = []
+    
+    def collect(el):
+        if isinstance(el.tag, str) and el.tag not in _NON_TEXT_TAGS:
+            if el.text:
+                parts.append(el.text)
+            for child in el:
+                collect(child)
+                if child.tail:
+                    parts.append(child.tail)
+    
+    collect(element)
+    return ''.join(part.strip() for part in parts)
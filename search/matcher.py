@@ -1,7 +1,7 @@
 """トラックマッチングモジュール"""
 
 from difflib import SequenceMatcher
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Iterable
 
 from models.track import Track
 from models.search_result import SearchResult
@@ -12,47 +12,92 @@ class TrackMatcher:
     
     SIMILARITY_THRESHOLD = 0.7
     
+    # マッチング方式
+    MODE_GREEDY = 'greedy'          # トラックごとに最良の候補を選ぶ（候補の重複あり）
+    MODE_ASSIGNMENT = 'assignment'  # 類似度の合計が最大になる1対1の割り当て
+    
     def match_tracks(self, original_tracks: List[Track],
-                    search_results: List[SearchResult]) -> List[Optional[Dict]]:
+                    search_results: List[SearchResult],
+                    mode: str = MODE_GREEDY) -> List[Optional[Dict]]:
         """
         オリジナルトラックと検索結果をマッチング
         
+        候補タイトルを一度だけ正規化・索引化し、上限値（長さ・文字頻度）で
+        勝ち目のない候補を枝刈りしてから SequenceMatcher で採点する。
+        greedy方式の結果は全組み合わせを総当たりした場合と同一になる。
+        
         Args:
             original_tracks: オリジナルのトラックリスト
             search_results: 検索結果リスト
+            mode: マッチング方式（'greedy' または 'assignment'）
         
         Returns:
             マッチング結果リスト（各トラックに対応）
         """
+        index = _CandidateIndex(search_results)
+        
+        if mode == self.MODE_ASSIGNMENT:
+            orders = self._assign(index, original_tracks)
+        else:
+            orders = [
+                index.find_best(orig_track, self.SIMILARITY_THRESHOLD)
+                for orig_track in original_tracks
+            ]
+        
         matched = []
         
-        for orig_track in original_tracks:
-            best_match = None
-            best_score = 0
-            
-            for result in search_results:
-                for result_track in result.tracks:
-                    # マッチングスコア計算
-                    score = self._calculate_similarity(
-                        orig_track,
-                        result_track,
-                        result
-                    )
-                    
-                    if score > best_score and score > self.SIMILARITY_THRESHOLD:
-                        best_score = score
-                        best_match = {
-                            'original': orig_track,
-                            'matched': result_track,
-                            'similarity': score,
-                            'source': result.source,
-                            'confidence': result.confidence
-                        }
+        for orig_track, best in zip(original_tracks, orders):
+            if best is None:
+                matched.append(None)
+                continue
             
-            matched.append(best_match)
+            score, order = best
+            _, result, result_track, _, _ = index.candidates[order]
+            matched.append({
+                'original': orig_track,
+                'matched': result_track,
+                'similarity': score,
+                'source': result.source,
+                'confidence': result.confidence
+            })
         
         return matched
     
+    def _assign(self, index: '_CandidateIndex',
+                original_tracks: List[Track]) -> List[Optional[Tuple[float, int]]]:
+        """
+        1対1の最適割り当て
+        
+        閾値を超える組み合わせだけで類似度行列（疎行列）を一度作り、
+        連結成分ごとにハンガリアン法で類似度の合計を最大化する。
+        
+        Returns:
+            各トラックの (スコア, 候補の走査順)、割り当てなしの場合はNone
+        """
+        # 閾値を超える辺: 行（原題トラック） -> {候補の走査順: スコア}
+        edges = [
+            index.scores_above(orig_track, self.SIMILARITY_THRESHOLD)
+            for orig_track in original_tracks
+        ]
+        
+        assigned: List[Optional[Tuple[float, int]]] = [None] * len(original_tracks)
+        
+        for rows, cols in _connected_components(edges):
+            # 未割り当ては0、割り当てはスコア分だけコストを下げる
+            cost = [
+                [-edges[row].get(col, 0.0) for col in cols]
+                for row in rows
+            ]
+            for i, j in enumerate(_solve_assignment(cost)):
+                if j < 0:
+                    continue
+                row, col = rows[i], cols[j]
+                score = edges[row].get(col)
+                if score is not None:
+                    assigned[row] = (score, col)
+        
+        return assigned
+    
     def _calculate_similarity(self, orig_track: Track,
                                 result_track: Dict,
                                 result: SearchResult) -> float:
@@ -79,3 +124,270 @@ class TrackMatcher:
         # 総合スコア
         return title_similarity * 0.7 + number_match * 0.3
 
+
+class _CandidateIndex:
+    """
+    検索結果トラックの索引
+    
+    同じタイトルの候補（同一リリースの別エディション等）は1つの
+    SequenceMatcher を共有し、類似度は (原題, 候補タイトル) ごとに1回だけ計算する。
+    """
+    
+    def __init__(self, search_results: List[SearchResult]):
+        # 候補: (走査順, 検索結果, トラック辞書, タイトル番号, トラック番号)
+        self.candidates: List[Tuple[int, SearchResult, Dict, int, int]] = []
+        self.by_number: Dict[int, List[int]] = {}
+        self.titles: List[str] = []
+        self._matchers: List[Optional[SequenceMatcher]] = []
+        title_ids: Dict[str, int] = {}
+        
+        for result in search_results:
+            for result_track in result.tracks:
+                title = result_track.get('title_en', '').lower()
+                title_id = title_ids.get(title)
+                if title_id is None:
+                    title_id = len(self.titles)
+                    title_ids[title] = title_id
+                    self.titles.append(title)
+                    self._matchers.append(None)
+                
+                number = result_track.get('number', 0)
+                order = len(self.candidates)
+                self.candidates.append((order, result, result_track, title_id, number))
+                self.by_number.setdefault(number, []).append(order)
+    
+    def _matcher(self, title_id: int) -> SequenceMatcher:
+        """候補タイトル側（seq2）を解析済みの SequenceMatcher を取得"""
+        matcher = self._matchers[title_id]
+        if matcher is None:
+            matcher = SequenceMatcher(None, '', self.titles[title_id])
+            self._matchers[title_id] = matcher
+        return matcher
+    
+    def _iter_orders(self, number: int) -> Iterable[int]:
+        """トラック番号が一致する候補を先に走査する順序"""
+        preferred = self.by_number.get(number, [])
+        if not preferred:
+            return range(len(self.candidates))
+        preferred_set = set(preferred)
+        rest = [o for o in range(len(self.candidates)) if o not in preferred_set]
+        return preferred + rest
+    
+    def find_best(self, orig_track: Track,
+                  threshold: float) -> Optional[Tuple[float, int]]:
+        """
+        原題トラックに最も近い候補を探す
+        
+        総当たりと同じく「閾値を超え、かつ最高スコア。同点なら走査順が先の候補」
+        を返す。スコアの上限が現在の最良値に届かない候補は採点しない。
+        
+        Returns:
+            (スコア, 候補の走査順)、該当なしの場合はNone
+        """
+        orig_title = orig_track.title_en.lower()
+        ratios: Dict[int, float] = {}
+        bounds: Dict[int, Tuple[float, float]] = {}
+        
+        best_score = 0
+        best_order = -1
+        
+        for order in self._iter_orders(orig_track.number):
+            _, _, _, title_id, number = self.candidates[order]
+            number_match = 1.0 if orig_track.number == number else 0.5
+            floor = max(best_score, threshold)
+            
+            ratio = ratios.get(title_id)
+            if ratio is None:
+                matcher = self._matcher(title_id)
+                matcher.set_seq1(orig_title)
+                
+                # 上限値による枝刈り（real_quick_ratio >= quick_ratio >= ratio）
+                quick = bounds.get(title_id)
+                if quick is None:
+                    quick = (matcher.real_quick_ratio(), -1.0)
+                    bounds[title_id] = quick
+                if not self._may_win(quick[0] * 0.7 + number_match * 0.3,
+                                     floor, order, best_order):
+                    continue
+                
+                if quick[1] < 0:
+                    quick = (quick[0], matcher.quick_ratio())
+                    bounds[title_id] = quick
+                if not self._may_win(quick[1] * 0.7 + number_match * 0.3,
+                                     floor, order, best_order):
+                    continue
+                
+                ratio = matcher.ratio()
+                ratios[title_id] = ratio
+            
+            score = ratio * 0.7 + number_match * 0.3
+            
+            if score > threshold and self._may_win(score, best_score, order, best_order):
+                best_score = score
+                best_order = order
+        
+        if best_order < 0:
+            return None
+        
+        return best_score, best_order
+    
+    def scores_above(self, orig_track: Track, threshold: float) -> Dict[int, float]:
+        """
+        スコアが閾値を超える全候補を取得（類似度行列の1行分）
+        
+        Returns:
+            {候補の走査順: スコア}
+        """
+        orig_title = orig_track.title_en.lower()
+        ratios: Dict[int, Optional[float]] = {}
+        scores: Dict[int, float] = {}
+        
+        for order, _, _, title_id, number in self.candidates:
+            number_match = 1.0 if orig_track.number == number else 0.5
+            
+            if title_id not in ratios:
+                matcher = self._matcher(title_id)
+                matcher.set_seq1(orig_title)
+                
+                # 番号一致時でも閾値に届かないタイトルは採点しない
+                if (matcher.real_quick_ratio() * 0.7 + 0.3 <= threshold or
+                        matcher.quick_ratio() * 0.7 + 0.3 <= threshold):
+                    ratios[title_id] = None
+                else:
+                    ratios[title_id] = matcher.ratio()
+            
+            ratio = ratios[title_id]
+            if ratio is None:
+                continue
+            
+            score = ratio * 0.7 + number_match * 0.3
+            if score > threshold:
+                scores[order] = score
+        
+        return scores
+    
+    @staticmethod
+    def _may_win(score: float, floor: float, order: int, best_order: int) -> bool:
+        """スコアが現在の最良候補を上回る（同点なら走査順が先）かどうか"""
+        if score > floor:
+            return True
+        return score == floor and best_order >= 0 and order < best_order
+
+
+def _connected_components(edges: List[Dict[int, float]]) -> List[Tuple[List[int], List[int]]]:
+    """
+    二部グラフ（行 -> 列の辺）を連結成分に分割
+    
+    Returns:
+        [(行番号リスト, 列番号リスト), ...]
+    """
+    col_rows: Dict[int, List[int]] = {}
+    for row, row_edges in enumerate(edges):
+        for col in row_edges:
+            col_rows.setdefault(col, []).append(row)
+    
+    seen_rows = set()
+    components = []
+    
+    for start in range(len(edges)):
+        if start in seen_rows or not edges[start]:
+            continue
+        
+        rows, cols = [], []
+        seen_cols = set()
+        stack = [start]
+        seen_rows.add(start)
+        
+        while stack:
+            row = stack.pop()
+            rows.append(row)
+            for col in edges[row]:
+                if col in seen_cols:
+                    continue
+                seen_cols.add(col)
+                cols.append(col)
+                for other in col_rows[col]:
+                    if other not in seen_rows:
+                        seen_rows.add(other)
+                        stack.append(other)
+        
+        components.append((sorted(rows), sorted(cols)))
+    
+    return components
+
+
+def _solve_assignment(cost: List[List[float]]) -> List[int]:
+    """
+    ハンガリアン法（最小コスト割り当て）
+    
+    行数が列数より多い場合はコスト0のダミー列を補う。
+    
+    Args:
+        cost: コスト行列（行数 x 列数）
+    
+    Returns:
+        各行に割り当てた列番号（ダミー列の場合は-1）
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = max(len(cost[0]), n)
+    
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)    # 列 -> 行（1始まり、0は未割り当て）
+    way = [0] * (m + 1)
+    
+    def at(i: int, j: int) -> float:
+        row = cost[i - 1]
+        return row[j - 1] if j <= len(row) else 0.0
+    
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = inf
+            j1 = 0
+            
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = at(i0, j) - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            
+            j0 = j1
+            if p[j0] == 0:
+                break
+        
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+    
+    num_cols = len(cost[0])
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if p[j] and j <= num_cols:
+            result[p[j] - 1] = j - 1
+    
+    return result
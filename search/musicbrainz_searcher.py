@@ -1,7 +1,11 @@
 """MusicBrainz検索モジュール"""
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import base64
+import hashlib
 import logging
+import re
 
 try:
     import musicbrainzngs
@@ -9,13 +13,43 @@ try:
 except ImportError:
     MUSICBRAINZ_AVAILABLE = False
 
+from models.cd_info import CDInfo
 from models.search_result import SearchResult
+from .rate_limiter import TokenBucket
+
+
+# CDの1秒あたりのセクタ数と、第1トラック前のプリギャップ（セクタ）
+SECTORS_PER_SECOND = 75
+PREGAP_SECTORS = 150
+
+# リリース取得時のinclude（aliasesを付けるとリリースと各レコーディングの別名も返る）
+RELEASE_INCLUDES = ['recordings', 'artist-credits', 'aliases']
+
+# 日本語のタイトルがあり得るリリースの言語・文字体系（text-representation）
+JAPANESE_LANGUAGES = {'jpn', 'mul'}
+JAPANESE_SCRIPTS = {'Jpan', 'Hira', 'Kana', 'Hrkt', 'Hani', 'Qaaa'}
+
+_JAPANESE_PATTERN = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
 
 
 class MusicBrainzSearcher:
     """MusicBrainz検索クラス"""
     
-    def __init__(self):
+    # 名前検索で取得するリリース数と、詳細を並行して取得する数
+    SEARCH_LIMIT = 5
+    MAX_PARALLEL_FETCHES = 3
+    
+    # 全インスタンスで共有するレート制限（MusicBrainzの制限はクライアント単位のため）
+    _rate_limiter: Optional[TokenBucket] = None
+    
+    def __init__(self, rate_limit: float = 1.0, burst: int = 2):
+        """
+        初期化
+        
+        Args:
+            rate_limit: 1秒あたりのリクエスト数
+            burst: 連続して送れるリクエスト数の上限
+        """
         self.logger = logging.getLogger(__name__)
         
         if not MUSICBRAINZ_AVAILABLE:
@@ -28,86 +62,378 @@ class MusicBrainzSearcher:
             "2.0",
             "https://github.com/yourproject"
         )
-        musicbrainzngs.set_rate_limit(limit_or_interval=1.0)
+        
+        # 検索1回あたりのリクエスト数（ログ用）
+        self.request_count = 0
+        
+        # musicbrainzngs標準のレート制限は通信中もロックを保持し、リクエストが
+        # 直列になるため無効にし、トークンバケットで送信間隔だけを制限する
+        musicbrainzngs.set_rate_limit(False)
+        limiter = MusicBrainzSearcher._rate_limiter
+        if limiter is None or limiter.rate != rate_limit or limiter.burst != burst:
+            MusicBrainzSearcher._rate_limiter = TokenBucket(rate_limit, burst)
+    
+    def _request(self, func, *args, _rate_limited: bool = True, **kwargs):
+        """レート制限に従ってMusicBrainz APIを呼び出す"""
+        if _rate_limited:
+            self._rate_limiter.acquire()
+        self.request_count += 1
+        return func(*args, **kwargs)
     
-    def search(self, artist: str, album: str) -> List[SearchResult]:
+    def search(self, artist: str, album: str,
+               durations: Optional[List[int]] = None,
+               toc: Optional[str] = None) -> List[SearchResult]:
         """
         MusicBrainzでアルバム検索
         
         Args:
             artist: アーティスト名
             album: アルバム名
+            durations: トラックごとの演奏時間（秒）
+            toc: CDの目次（"先頭 最終 リードアウト オフセット..."、セクタ単位）
         
         Returns:
             検索結果リスト
         """
-        if not MUSICBRAINZ_AVAILABLE:
+        try:
+            return list(self.iter_search(artist, album, durations=durations, toc=toc))
+        
+        except Exception as e:
+            self.logger.error(f"MusicBrainz検索エラー: {e}")
             return []
+    
+    def iter_search(self, artist: str, album: str,
+                    durations: Optional[List[int]] = None,
+                    toc: Optional[str] = None) -> Iterator[SearchResult]:
+        """
+        MusicBrainzでアルバム検索（リリース詳細を取得するたびに結果を返す）
+        
+        目次（TOC）またはトラックの演奏時間があれば、まずディスクIDで該当リリースを
+        1回の問い合わせで特定する。見つからない場合のみ名前による検索を行う。
+        通信エラーは呼び出し元へ送出する（「該当なし」と区別するため）。
+        
+        Args:
+            artist: アーティスト名
+            album: アルバム名
+            durations: トラックごとの演奏時間（秒）
+            toc: CDの目次（"先頭 最終 リードアウト オフセット..."、セクタ単位）
+        
+        Yields:
+            検索結果
+        """
+        if not MUSICBRAINZ_AVAILABLE:
+            return
         
+        self.request_count = 0
         try:
-            # リリース検索
-            result = musicbrainzngs.search_releases(
-                artist=artist,
-                release=album,
-                limit=5
+            yield from self._iter_search(artist, album, durations, toc)
+        finally:
+            self.logger.debug(f"MusicBrainzリクエスト数: {self.request_count} ({artist} - {album})")
+    
+    def _iter_search(self, artist: str, album: str,
+                     durations: Optional[List[int]],
+                     toc: Optional[str]) -> Iterator[SearchResult]:
+        """iter_search の本体"""
+        # ディスクID（TOC）による特定
+        if not toc and durations:
+            toc = toc_from_durations(durations)
+        if toc:
+            found = False
+            for result in self._iter_disc_results(toc):
+                found = True
+                yield result
+            if found:
+                return
+            self.logger.info("ディスクIDで特定できなかったため名前で検索します")
+        
+        # リリース検索
+        result = self._request(
+            musicbrainzngs.search_releases,
+            artist=artist,
+            release=album,
+            limit=self.SEARCH_LIMIT
+        )
+        
+        num_tracks = len(durations) if durations else 0
+        releases = self._prioritize_releases(result['release-list'], album, num_tracks)
+        yield from self._iter_release_details(self._filter_releases(releases), num_tracks)
+    
+    def _filter_releases(self, releases: List[Dict]) -> List[Dict]:
+        """
+        言語・文字体系から日本語タイトルがあり得ないリリースを除く
+        
+        レコーディングの別名は同じ録音を含むリリース間で共通のため、
+        すべて除外される場合でも優先度の最も高い1件は取得する。
+        """
+        candidates = [r for r in releases if not self._rules_out_japanese(r)]
+        skipped = len(releases) - len(candidates)
+        if skipped:
+            self.logger.debug(f"日本語タイトルのないリリースを{skipped}件省略")
+        return candidates or releases[:1]
+    
+    @staticmethod
+    def _rules_out_japanese(release: Dict) -> bool:
+        """リリースの言語・文字体系が日本語以外と明示されているか"""
+        text = release.get('text-representation', {})
+        language = text.get('language')
+        script = text.get('script')
+        return bool(
+            (language and language not in JAPANESE_LANGUAGES) or
+            (script and script not in JAPANESE_SCRIPTS)
+        )
+    
+    def _prioritize_releases(self, releases: List[Dict], album: str,
+                             num_tracks: int) -> List[Dict]:
+        """
+        詳細を取得するリリースを一致しそうな順に並べる
+        
+        トラック数とアルバム名の一致度（SearchResult.calculate_match_score）、
+        同点ならMusicBrainzの検索スコアの高い順。
+        """
+        cd_info = CDInfo(album=album, num_tracks=num_tracks)
+        
+        def priority(release: Dict) -> Tuple[float, int]:
+            track_count = sum(
+                int(medium.get('track-count', 0) or 0)
+                for medium in release.get('medium-list', [])
+            ) or int(release.get('medium-track-count', 0) or 0)
+            candidate = SearchResult(
+                source='musicbrainz',
+                album_title=release.get('title', ''),
+                tracks=[{}] * track_count,
+                confidence='medium'
             )
-            
-            results = []
-            
-            for release in result['release-list']:
-                release_id = release['id']
+            return (candidate.calculate_match_score(cd_info), int(release.get('ext:score', 0) or 0))
+        
+        return sorted(releases, key=priority, reverse=True)
+    
+    def _iter_release_details(self, releases: List[Dict],
+                              num_tracks: int) -> Iterator[SearchResult]:
+        """
+        リリース詳細を並行して取得し、取得できた順に結果を返す
+        
+        トークンバケットの許す範囲で優先度の高い順に送信し、応答待ちを重ねる。
+        全トラックの邦題がそろうリリースが見つかった時点で、未送信の分は取得しない。
+        
+        Args:
+            releases: 優先度順のリリース一覧
+            num_tracks: CDのトラック数（不明の場合は0）
+        
+        Yields:
+            検索結果
+        """
+        if not releases:
+            return
+        
+        pending = list(releases)
+        futures = {}
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(releases), self.MAX_PARALLEL_FETCHES),
+            thread_name_prefix='musicbrainz'
+        )
+        try:
+            while pending or futures:
+                # 送信枠とトークンがあれば次のリリースを送信（応答待ちがなければトークンを待つ）
+                if pending and len(futures) < self.MAX_PARALLEL_FETCHES:
+                    if self._rate_limiter.acquire(timeout=0 if futures else None):
+                        release = pending.pop(0)
+                        future = executor.submit(self._get_release, release['id'], False)
+                        futures[future] = release
+                        continue
                 
-                # 詳細情報取得
-                tracks = self._get_release_tracks(release_id)
+                # 送信枠が空いていれば次のトークンが貯まるまで、枠が埋まっていれば応答があるまで待つ
+                # （枠が埋まったままトークン待ちの0秒で戻ると空回りするため）
+                if pending and len(futures) < self.MAX_PARALLEL_FETCHES:
+                    timeout = self._rate_limiter.time_until_available()
+                else:
+                    timeout = None
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
                 
-                # 日本語タイトルが1つでもあれば結果に追加
-                if any(t['title_ja'] for t in tracks):
-                    results.append(SearchResult(
+                for future in done:
+                    release = futures.pop(future)
+                    detail = future.result()
+                    if detail is None:
+                        continue
+                    tracks = self._parse_release_tracks(detail)
+                    
+                    # 日本語タイトルが1つでもあれば結果に追加
+                    if not any(t['title_ja'] for t in tracks):
+                        continue
+                    
+                    yield SearchResult(
                         source='musicbrainz',
                         album_title=release['title'],
                         tracks=tracks,
                         confidence='medium',
-                        metadata={'mbid': release_id}
-                    ))
-            
-            return results
+                        metadata=self._release_metadata(detail)
+                    )
+                    
+                    if self._covers_all_tracks(tracks, num_tracks):
+                        self.logger.info(
+                            f"全トラックの邦題を取得できたため残りのリリースは省略: {release['title']}"
+                        )
+                        return
+        finally:
+            executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _covers_all_tracks(tracks: List[Dict], num_tracks: int) -> bool:
+        """CDの全トラック（トラック数不明の場合はリリースの全トラック）に邦題があるか"""
+        numbers = {t['number'] for t in tracks if t['title_ja']}
+        if num_tracks:
+            return all(n in numbers for n in range(1, num_tracks + 1))
+        return bool(tracks) and all(t['title_ja'] for t in tracks)
+    
+    def _iter_disc_results(self, toc: str) -> Iterator[SearchResult]:
+        """
+        目次（TOC）から該当リリースを取得（トラック情報込みで1回の問い合わせ）
         
-        except Exception as e:
-            self.logger.error(f"MusicBrainz検索エラー: {e}")
-            return []
+        ディスクIDが完全一致すれば信頼度high、TOCの近似一致ならmediumとする。
+        
+        Args:
+            toc: CDの目次
+        
+        Yields:
+            検索結果
+        """
+        try:
+            disc_id, offsets = disc_id_from_toc(toc)
+        except ValueError as e:
+            self.logger.warning(f"TOCが不正です: {e}")
+            return
+        
+        try:
+            response = self._request(
+                musicbrainzngs.get_releases_by_discid,
+                disc_id,
+                includes=RELEASE_INCLUDES,
+                toc=toc,
+                cdstubs=False
+            )
+        except musicbrainzngs.ResponseError as e:
+            # 該当なし（404）
+            self.logger.debug(f"ディスクIDの該当なし: {e}")
+            return
+        
+        if 'disc' in response:
+            releases = response['disc'].get('release-list', [])
+            confidence = 'high'
+            self.logger.info(f"ディスクIDが一致しました: {disc_id} ({len(releases)}件)")
+        else:
+            releases = response.get('release-list', [])
+            confidence = 'medium'
+            self.logger.info(f"TOCの近似一致: {len(releases)}件")
+        
+        num_tracks = len(offsets)
+        for release in releases:
+            tracks = self._parse_release_tracks(release, disc_id=disc_id, num_tracks=num_tracks)
+            
+            if any(t['title_ja'] for t in tracks):
+                yield SearchResult(
+                    source='musicbrainz',
+                    album_title=release['title'],
+                    tracks=tracks,
+                    confidence=confidence,
+                    metadata=dict(self._release_metadata(release), discid=disc_id)
+                )
     
-    def _get_release_tracks(self, release_id: str) -> List[Dict]:
-        """リリースのトラック情報取得"""
+    def _get_release(self, release_id: str, rate_limited: bool = True) -> Optional[Dict]:
+        """
+        リリース詳細取得（トラック・別名を含めて1回の問い合わせ）
+        
+        Args:
+            release_id: リリースID
+            rate_limited: レート制限のトークンを取得してから送信するか
+                          （呼び出し元で取得済みの場合はFalse）
+        
+        Returns:
+            リリース情報、取得失敗時はNone
+        """
         try:
-            release_detail = musicbrainzngs.get_release_by_id(
+            release_detail = self._request(
+                musicbrainzngs.get_release_by_id,
                 release_id,
-                includes=['recordings', 'artist-credits']
+                includes=RELEASE_INCLUDES,
+                _rate_limited=rate_limited
             )
             
-            tracks = []
-            medium_list = release_detail['release'].get('medium-list', [])
-            
-            for medium in medium_list:
-                for track in medium.get('track-list', []):
-                    recording = track['recording']
-                    
-                    # 日本語エイリアス検索
-                    ja_title = self._find_japanese_alias(recording)
-                    
-                    tracks.append({
-                        'number': int(track['position']),
-                        'title_ja': ja_title,
-                        'title_en': recording['title']
-                    })
-            
-            return tracks
+            return release_detail['release']
+        
+        except musicbrainzngs.NetworkError:
+            raise
         
         except Exception as e:
             self.logger.error(f"リリース詳細取得エラー: {e}")
-            return []
+            return None
+    
+    def _release_metadata(self, release: Dict) -> Dict:
+        """検索結果に付けるリリースの情報（日本語のアルバム名があれば含める）"""
+        metadata = {'mbid': release['id']}
+        album_ja = self._find_japanese_alias(release)
+        if album_ja:
+            metadata['album_title_ja'] = album_ja
+        return metadata
+    
+    def _parse_release_tracks(self, release: Dict,
+                              disc_id: Optional[str] = None,
+                              num_tracks: Optional[int] = None) -> List[Dict]:
+        """
+        リリース情報からトラック情報を取り出す
+        
+        複数枚組の場合、ディスクIDが一致するディスク、なければトラック数が
+        一致するディスクがあれば、そのディスクのトラックだけを使う。
+        
+        Args:
+            release: リリース情報（recordingsを含む）
+            disc_id: 対象ディスクのディスクID
+            num_tracks: 対象ディスクのトラック数
+        
+        Returns:
+            トラック情報リスト
+        """
+        medium_list = release.get('medium-list', [])
+        
+        if disc_id or num_tracks:
+            selected = [
+                medium for medium in medium_list
+                if disc_id and any(d.get('id') == disc_id for d in medium.get('disc-list', []))
+            ] or [
+                medium for medium in medium_list
+                if num_tracks and len(medium.get('track-list', [])) == num_tracks
+            ]
+            if selected:
+                medium_list = selected
+        
+        japanese_release = not self._rules_out_japanese(release)
+        
+        tracks = []
+        for medium in medium_list:
+            for track in medium.get('track-list', []):
+                recording = track['recording']
+                
+                # 日本語エイリアス検索（なければ日本盤のトラック名）
+                ja_title = self._find_japanese_alias(recording)
+                if not ja_title and japanese_release:
+                    ja_title = self._japanese_track_title(track, recording)
+                
+                tracks.append({
+                    'number': int(track['position']),
+                    'title_ja': ja_title,
+                    'title_en': recording['title']
+                })
+        
+        return tracks
+    
+    @staticmethod
+    def _japanese_track_title(track: Dict, recording: Dict) -> Optional[str]:
+        """トラック名が日本語で、レコーディング名（原題）と異なる場合はそれを邦題とする"""
+        title = track.get('title')
+        if title and title != recording.get('title') and _JAPANESE_PATTERN.search(title):
+            return title
+        return None
     
     def _find_japanese_alias(self, recording: Dict) -> Optional[str]:
-        """レコーディングの日本語エイリアスを検索"""
+        """レコーディング（またはリリース）の日本語エイリアスを検索"""
         aliases = recording.get('alias-list', [])
         
         for alias in aliases:
@@ -116,3 +442,61 @@ class MusicBrainzSearcher:
         
         return None
 
+
+def toc_from_durations(durations: List[int]) -> Optional[str]:
+    """
+    トラックの演奏時間から目次（TOC）を組み立てる
+    
+    演奏時間は秒単位のため実際のTOCとは誤差があり、ディスクIDの完全一致は
+    期待できないが、MusicBrainzのTOC近似検索には十分な精度になる。
+    
+    Args:
+        durations: トラックごとの演奏時間（秒）
+    
+    Returns:
+        "1 最終トラック リードアウト オフセット..." 形式のTOC、組み立てられない場合はNone
+    """
+    if not durations or len(durations) > 99 or any(d <= 0 for d in durations):
+        return None
+    
+    offsets = [PREGAP_SECTORS]
+    for duration in durations:
+        offsets.append(offsets[-1] + int(round(duration * SECTORS_PER_SECOND)))
+    
+    leadout = offsets.pop()
+    return ' '.join(str(v) for v in [1, len(durations), leadout] + offsets)
+
+
+def disc_id_from_toc(toc: str) -> Tuple[str, List[int]]:
+    """
+    目次（TOC）からMusicBrainzのディスクIDを計算
+    
+    Args:
+        toc: "先頭 最終 リードアウト オフセット..." 形式のTOC（セクタ単位）
+    
+    Returns:
+        (ディスクID, 各トラックの開始オフセット)
+    
+    Raises:
+        ValueError: TOCの形式が不正な場合
+    """
+    values = [int(v) for v in toc.split()]
+    if len(values) < 4:
+        raise ValueError(toc)
+    
+    first, last, leadout = values[:3]
+    offsets = values[3:]
+    if not 1 <= first <= last <= 99 or len(offsets) != last - first + 1:
+        raise ValueError(toc)
+    
+    sha1 = hashlib.sha1()
+    sha1.update(b"%02X" % first)
+    sha1.update(b"%02X" % last)
+    # 0番目はリードアウト、以降はトラック番号の位置に開始オフセット（計100個）
+    frames = [leadout] + [0] * (first - 1) + offsets
+    frames += [0] * (100 - len(frames))
+    for frame in frames:
+        sha1.update(b"%08X" % frame)
+    
+    disc_id = base64.b64encode(sha1.digest(), altchars=b'._').decode('ascii').replace('=', '-')
+    return disc_id, offsets
@@ -0,0 +1,69 @@
+"""レート制限モジュール"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレート制限（スレッドセーフ）
+    
+    1秒あたり rate 個のトークンが最大 burst 個まで貯まり、リクエストごとに1個消費する。
+    待つのはトークンの取得までで、リクエスト自体は並行して実行できるため、
+    平均レートを守りつつ応答待ちの時間を重ねられる。
+    """
+    
+    def __init__(self, rate: float = 1.0, burst: int = 1):
+        """
+        初期化
+        
+        Args:
+            rate: 1秒あたりのリクエスト数
+            burst: 連続して送れるリクエスト数の上限
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rateは正の値、burstは1以上を指定してください")
+        self.rate = rate
+        self.burst = burst
+        
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        トークンを1個取得（なければ貯まるまで待機）
+        
+        Args:
+            timeout: 待機時間の上限（秒）、Noneの場合は無制限
+        
+        Returns:
+            取得できたかどうか
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+    
+    def time_until_available(self) -> float:
+        """次のトークンが取得できるまでの時間（秒）、今すぐ取得できる場合は0"""
+        with self._lock:
+            tokens = min(self.burst, self._tokens + (time.monotonic() - self._updated_at) * self.rate)
+            return max(0.0, (1 - tokens) / self.rate)
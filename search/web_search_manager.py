@@ -1,7 +1,10 @@
 """Web検索統合管理モジュール"""
 
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import queue
+import time
 
 from models.cd_info import CDInfo
 from models.search_result import SearchResult
@@ -12,9 +15,17 @@ from .confidence_scorer import ConfidenceScorer
 from .cache_manager import CacheManager
 
 
+# 検索ソースの完了・失敗を表す番兵
+_SOURCE_DONE = object()
+_SOURCE_FAILED = object()
+
+
 class WebSearchManager:
     """Web検索統合管理クラス"""
     
+    # 同時に問い合わせる検索ソースの上限
+    MAX_WORKERS = 4
+    
     def __init__(self, config: dict):
         """
         初期化
@@ -25,20 +36,35 @@ class WebSearchManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # キャッシュ管理
+        self.cache = CacheManager(
+            cache_dir=config.get('cache_dir', 'cache'),
+            expire_days=config.get('cache_expire_days', 30),
+            negative_expire_days=config.get('negative_cache_expire_days', 1),
+            max_size_mb=config.get('max_cache_size_mb', 100),
+            memory_entries=config.get('memory_cache_entries', 256),
+            memory_size_mb=config.get('memory_cache_size_mb', 16)
+        )
+        
         # 検索エンジン初期化
         self.searchers = []
         
         if config.get('use_wikipedia_ja', True):
-            self.searchers.append(WikipediaSearcher())
+            self.searchers.append(WikipediaSearcher(
+                batch_fetch=config.get('wikipedia_batch_fetch', True),
+                html_parser=config.get('wikipedia_html_parser', 'auto'),
+                page_cache=self.cache if config.get('enable_cache', True) else None
+            ))
         
         if config.get('use_musicbrainz', True):
-            self.searchers.append(MusicBrainzSearcher())
+            self.searchers.append(MusicBrainzSearcher(
+                rate_limit=config.get('musicbrainz_rate_limit', 1.0),
+                burst=config.get('musicbrainz_burst', 2)
+            ))
         
-        # キャッシュ管理
-        self.cache = CacheManager(
-            cache_dir=config.get('cache_dir', 'cache'),
-            expire_days=config.get('cache_expire_days', 30)
-        )
+        # タイムアウト（全体 / ソース単位）
+        self.search_timeout = config.get('search_timeout', 30)
+        self.source_timeout = config.get('source_timeout', self.search_timeout)
         
         # マッチャー
         self.matcher = TrackMatcher()
@@ -48,7 +74,8 @@ class WebSearchManager:
     
     def search_titles(self, cd_info: CDInfo,
                      force_refresh: bool = False,
-                     progress_callback: Optional[Callable[[int, int], None]] = None) -> List[SearchResult]:
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     result_callback: Optional[Callable[[SearchResult], None]] = None) -> List[SearchResult]:
         """
         CD情報から邦題を検索
         
@@ -56,39 +83,178 @@ class WebSearchManager:
             cd_info: CD情報
             force_refresh: キャッシュを無視して強制検索
             progress_callback: 進行状況コールバック関数(current, total)
+            result_callback: 検索結果を1件取得するたびに呼ばれるコールバック関数
         
         Returns:
-            検索結果リスト
+            検索結果リスト（検索ソースの優先順位順）
+        """
+        collected = []
+        
+        for idx, result in self._iter_indexed_results(cd_info, force_refresh, progress_callback):
+            collected.append((idx, result))
+            if result_callback:
+                result_callback(result)
+        
+        # 到着順ではなくソースの優先順位順に並べ替える
+        collected.sort(key=lambda item: item[0])
+        return [result for _, result in collected]
+    
+    def iter_search_titles(self, cd_info: CDInfo,
+                           force_refresh: bool = False,
+                           progress_callback: Optional[Callable[[int, int], None]] = None
+                           ) -> Iterator[SearchResult]:
+        """
+        CD情報から邦題を検索し、結果を取得した順に逐次返す
+        
+        最も速いソースの結果から順に返すため、全ソースの完了を待たずに
+        画面を更新できる。
+        
+        Args:
+            cd_info: CD情報
+            force_refresh: キャッシュを無視して強制検索
+            progress_callback: 進行状況コールバック関数(current, total)
+        
+        Yields:
+            検索結果
+        """
+        for _, result in self._iter_indexed_results(cd_info, force_refresh, progress_callback):
+            yield result
+    
+    def _iter_indexed_results(self, cd_info: CDInfo,
+                              force_refresh: bool = False,
+                              progress_callback: Optional[Callable[[int, int], None]] = None
+                              ) -> Iterator[Tuple[int, SearchResult]]:
+        """
+        キャッシュまたは全検索ソースから (ソース番号, 検索結果) を逐次返す
+        
+        全ソースが期限内にエラーなく完了した場合のみ、結果をキャッシュに保存する。
+        結果が0件の場合も「該当なし」として保存し、再検索を抑止する。
         """
         # キャッシュ確認
         if not force_refresh and self.config.get('enable_cache', True):
             cached = self.cache.get(cd_info.artist, cd_info.album)
-            if cached:
-                self.logger.info("キャッシュから検索結果を読み込み")
-                return [SearchResult(**r) for r in cached]
+            if cached is not None:
+                if cached:
+                    self.logger.info("キャッシュから検索結果を読み込み")
+                else:
+                    self.logger.info("キャッシュ済み: 検索結果なし")
+                for r in cached:
+                    yield 0, SearchResult(**r)
+                return
         
-        # 検索実行
-        all_results = []
+        # 検索実行（全ソースへ並行して問い合わせ）
+        status = {'completed': True}
+        collected = []
         
-        for idx, searcher in enumerate(self.searchers):
+        for idx, result in self._iter_source_results(cd_info, status, progress_callback):
+            collected.append((idx, result))
+            yield idx, result
+        
+        # キャッシュ保存（結果なしも短い有効期限で保存する）
+        if status['completed'] and self.config.get('enable_cache', True):
+            collected.sort(key=lambda item: item[0])
+            cache_data = [r.__dict__ for _, r in collected]
+            self.cache.set(cd_info.artist, cd_info.album, cache_data)
+    
+    def _iter_source_results(self, cd_info: CDInfo, status: dict,
+                             progress_callback: Optional[Callable[[int, int], None]] = None
+                             ) -> Iterator[Tuple[int, SearchResult]]:
+        """
+        全検索ソースへ並行して問い合わせ、解析済みの結果から順に返す
+        
+        全体の期限（search_timeout）とソースごとの期限（source_timeout）を
+        超えたソースは待たずに打ち切る。打ち切り・エラーとなったソースがある場合は
+        status['completed'] を False にする。
+        
+        Args:
+            cd_info: CD情報
+            status: 完了状態を書き込む辞書
+            progress_callback: 進行状況コールバック関数(current, total)
+        
+        Yields:
+            (ソース番号, 検索結果)
+        """
+        total = len(self.searchers)
+        if total == 0:
+            return
+        
+        result_queue: queue.Queue = queue.Queue()
+        started_at = time.monotonic()
+        overall_deadline = started_at + self.search_timeout
+        
+        # ディスク特定用の情報（演奏時間・目次）
+        durations = [track.duration for track in cd_info.tracks]
+        
+        def run_searcher(idx: int, searcher):
             try:
+                for result in searcher.iter_search(cd_info.artist, cd_info.album,
+                                                   durations=durations, toc=cd_info.toc):
+                    result_queue.put((idx, result))
+            except Exception as e:
+                self.logger.error(f"検索エラー ({searcher.__class__.__name__}): {e}")
+                result_queue.put((idx, _SOURCE_FAILED))
+            else:
+                result_queue.put((idx, _SOURCE_DONE))
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(total, self.MAX_WORKERS),
+            thread_name_prefix='web-search'
+        )
+        futures = {}
+        active = {}
+        try:
+            for idx, searcher in enumerate(self.searchers):
                 self.logger.info(f"{searcher.__class__.__name__}で検索中...")
+                futures[idx] = executor.submit(run_searcher, idx, searcher)
+                active[idx] = min(started_at + self.source_timeout, overall_deadline)
+            
+            done_count = 0
+            
+            while active:
+                now = time.monotonic()
                 
-                results = searcher.search(cd_info.artist, cd_info.album)
-                all_results.extend(results)
+                # 期限切れのソースを打ち切る
+                for idx, deadline in list(active.items()):
+                    if now >= deadline:
+                        futures[idx].cancel()
+                        del active[idx]
+                        status['completed'] = False
+                        done_count += 1
+                        self.logger.warning(
+                            f"検索タイムアウト ({self.searchers[idx].__class__.__name__})"
+                        )
+                        if progress_callback:
+                            progress_callback(done_count, total)
                 
-                if progress_callback:
-                    progress_callback(idx + 1, len(self.searchers))
+                if not active:
+                    break
                 
-            except Exception as e:
-                self.logger.error(f"検索エラー ({searcher.__class__.__name__}): {e}")
-        
-        # キャッシュ保存
-        if all_results and self.config.get('enable_cache', True):
-            cache_data = [r.__dict__ for r in all_results]
-            self.cache.set(cd_info.artist, cd_info.album, cache_data)
-        
-        return all_results
+                try:
+                    idx, item = result_queue.get(
+                        timeout=max(0.0, min(active.values()) - time.monotonic())
+                    )
+                except queue.Empty:
+                    continue
+                
+                # 打ち切り済みソースからの遅れた結果は捨てる
+                if idx not in active:
+                    continue
+                
+                if item is _SOURCE_DONE or item is _SOURCE_FAILED:
+                    if item is _SOURCE_FAILED:
+                        status['completed'] = False
+                    del active[idx]
+                    done_count += 1
+                    if progress_callback:
+                        progress_callback(done_count, total)
+                    continue
+                
+                yield idx, item
+        finally:
+            # 応答のないソースは待たずに切り離す
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
     
     def apply_search_results(self, cd_info: CDInfo,
                             search_results: List[SearchResult],
@@ -109,7 +275,8 @@ class WebSearchManager:
         # トラックマッチング
         matched_tracks = self.matcher.match_tracks(
             cd_info.tracks,
-            search_results
+            search_results,
+            mode=self.config.get('match_mode', TrackMatcher.MODE_GREEDY)
         )
         
         # 各トラックに適用
@@ -1,12 +1,33 @@
 """Wikipedia検索モジュール"""
 
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import List, Optional, Dict, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import re
+import html
 import logging
 
 from models.search_result import SearchResult
+from .html_extractors import TRACKLIST_HEADING, create_extractor
+from .cache_manager import CacheManager
+
+# ウィキテキストの見出し行（== 見出し ==）
+_WIKI_HEADING = re.compile(r'^(={1,6})\s*(.+?)\s*\1\s*$', re.MULTILINE)
+
+# 描画後に別のテキストノードになるマークアップ（リンク、外部リンク、太字・斜体、HTMLタグ）
+_WIKI_MARKUP = re.compile(
+    r"\[\[(?:[^\]|]*\|)?([^\]]*)\]\]"
+    r"|\[(?:https?:)?//\S+\s+([^\]]*)\]"
+    r"|'{2,}"
+    r"|<[^>]+>"
+)
+_NODE_BREAK = '\x00'
+
+
+class WikipediaApiError(requests.exceptions.RequestException):
+    """MediaWiki APIのエラー応答（ratelimited / maxlag / readonly など）"""
+    pass
 
 
 class WikipediaSearcher:
@@ -14,60 +35,300 @@ class WikipediaSearcher:
     
     API_URL = 'https://ja.wikipedia.org/w/api.php'
     TIMEOUT = 10
+    MAX_PAGES = 3  # トラックリストを取得する検索上位ページ数
+    MAX_PARALLEL_FETCHES = 3  # 同時に取得するページ数
     
-    def __init__(self):
+    def __init__(self, batch_fetch: bool = True, html_parser: str = 'auto',
+                 page_cache: Optional[CacheManager] = None):
+        """
+        初期化
+        
+        Args:
+            batch_fetch: 検索と候補ページの本文（ウィキテキスト）取得をまとめて行うか
+            html_parser: トラックリスト抽出に使うHTMLパーサー（auto / lxml / strainer / soup）
+            page_cache: ページごとのトラックリストを保存するキャッシュ（Noneの場合は保存しない）
+        """
+        self.batch_fetch = batch_fetch
+        self.extractor = create_extractor(html_parser)
+        self.page_cache = page_cache
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'iTunes-to-EAC/2.0 (https://github.com/yourproject)'
+            'User-Agent': 'iTunes-to-EAC/2.0 (https://github.com/yourproject)',
+            'Accept-Encoding': 'gzip, deflate'
         })
+        # 並行取得する分だけ接続を保持して使い回す（keep-alive）
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.MAX_PARALLEL_FETCHES
+        ))
     
-    def search(self, artist: str, album: str) -> List[SearchResult]:
+    def search(self, artist: str, album: str,
+               durations: Optional[List[int]] = None,
+               toc: Optional[str] = None) -> List[SearchResult]:
         """
         Wikipediaでアルバム検索
         
         Args:
             artist: アーティスト名
             album: アルバム名
+            durations: 未使用（検索ソース共通の引数）
+            toc: 未使用（検索ソース共通の引数）
         
         Returns:
             検索結果リスト
         """
-        search_query = f"{artist} {album}"
-        
         try:
-            # ページ検索
-            search_results = self._search_pages(search_query)
-            
-            results = []
-            
-            for page_info in search_results[:3]:  # 上位3件のみ
-                # ページ内容取得
-                tracks = self._extract_tracklist(page_info['pageid'])
-                
-                if tracks:
-                    results.append(SearchResult(
-                        source='wikipedia',
-                        album_title=page_info['title'],
-                        tracks=tracks,
-                        confidence='high',
-                        url=f"https://ja.wikipedia.org/?curid={page_info['pageid']}"
-                    ))
-            
-            return results
+            return list(self.iter_search(artist, album))
         
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Wikipedia検索エラー: {e}")
             return []
     
+    def iter_search(self, artist: str, album: str,
+                    durations: Optional[List[int]] = None,
+                    toc: Optional[str] = None) -> Iterator[SearchResult]:
+        """
+        Wikipediaでアルバム検索（ページを解析するたびに結果を返す）
+        
+        通信エラーやAPIのエラー応答は呼び出し元へ送出する（「該当なし」と区別するため）。
+        
+        Args:
+            artist: アーティスト名
+            album: アルバム名
+            durations: 未使用（検索ソース共通の引数）
+            toc: 未使用（検索ソース共通の引数）
+        
+        Yields:
+            検索結果
+        """
+        search_query = f"{artist} {album}"
+        
+        # ページ検索（キャッシュを使わない一括取得では本文も同時に取得）
+        if self.batch_fetch and self.page_cache is None:
+            pages = self._search_pages_with_content(search_query)
+        else:
+            pages = self._search_pages(search_query)
+        
+        # リビジョンが変わっていないページはキャッシュのトラックリストを使う
+        known_tracks = self._cached_tracks(pages)
+        
+        if self.batch_fetch:
+            self._extract_from_wikitexts(pages, known_tracks)
+        
+        yield from self._iter_page_results(pages, known_tracks)
+    
+    def _extract_from_wikitexts(self, pages: List[Dict], known_tracks: Dict[int, List[Dict]]):
+        """
+        ウィキテキストからトラックリストを抽出（一括取得時）
+        
+        収録曲が単純な番号付きリストのページは known_tracks に追加する。テンプレートや
+        表などでウィキテキストから抽出できないページは、後でHTMLを取得する。
+        
+        Args:
+            pages: 検索順の候補ページ（本文を取得した場合は wikitext を含む）
+            known_tracks: 取得済みのトラックリスト（pageid -> トラック）
+        """
+        if self.page_cache is not None:
+            # 変更されたページ・未取得のページの本文のみまとめて取得
+            contents = self._get_wikitexts([
+                page['pageid'] for page in pages if page['pageid'] not in known_tracks
+            ])
+            for page in pages:
+                page.update(contents.get(page['pageid'], {}))
+        
+        for page in pages:
+            if page['pageid'] in known_tracks:
+                continue
+            
+            tracks = self._extract_tracklist_from_wikitext(page.get('wikitext', ''))
+            if tracks:
+                known_tracks[page['pageid']] = tracks
+                self._store_page(page, tracks)
+    
+    def _cached_tracks(self, pages: List[Dict]) -> Dict[int, List[Dict]]:
+        """
+        キャッシュ済みで、リビジョンが変わっていないページのトラックリスト
+        
+        Args:
+            pages: リビジョンID（revid）を含む候補ページ
+        
+        Returns:
+            pageid -> トラックリスト（トラックリストのないページは空リスト）
+        """
+        if self.page_cache is None or not pages:
+            return {}
+        
+        cached = self.page_cache.get_pages([page['pageid'] for page in pages])
+        
+        known_tracks = {}
+        for page in pages:
+            entry = cached.get(page['pageid'])
+            if entry and page.get('revid') and entry[0] == page['revid']:
+                known_tracks[page['pageid']] = entry[1]
+        
+        if known_tracks:
+            self.logger.debug(f"更新されていないページのため再取得を省略: {len(known_tracks)}/{len(pages)}件")
+        return known_tracks
+    
+    def _store_page(self, page: Dict, tracks: List[Dict]):
+        """ページのトラックリストをリビジョンIDとともにキャッシュへ保存"""
+        if self.page_cache is not None and page.get('revid'):
+            self.page_cache.set_page(page['pageid'], page['revid'], tracks)
+    
+    def _iter_page_results(self, pages: List[Dict],
+                           known_tracks: Optional[Dict[int, List[Dict]]] = None) -> Iterator[SearchResult]:
+        """
+        候補ページのトラックリストを並行して取得し、検索順に結果を返す
+        
+        通信はワーカースレッドで行い、HTMLの解析は呼び出し元のスレッドで行う。
+        1ページを解析している間も他のページの取得が進む。
+        
+        各ページはまず見出し一覧（prop=sections）から収録曲のセクションを探し、そのセクションの
+        HTMLだけを取得・解析する。該当セクションがない（または抽出できない）場合のみ
+        ページ全体を取得する。
+        
+        Args:
+            pages: 検索順の候補ページ
+            known_tracks: 取得済みのトラックリスト（pageid -> トラック、含まれないページはHTMLを取得）
+        
+        Yields:
+            検索結果
+        """
+        known_tracks = known_tracks or {}
+        pages_by_id = {page['pageid']: page for page in pages}
+        results: Dict[int, List[Dict]] = {}
+        futures = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.MAX_PARALLEL_FETCHES,
+            thread_name_prefix='wikipedia'
+        )
+        try:
+            for page in pages:
+                if page['pageid'] in known_tracks:
+                    results[page['pageid']] = known_tracks[page['pageid']]
+                else:
+                    future = executor.submit(self._fetch_tracklist_html, page['pageid'])
+                    futures[future] = page['pageid']
+            
+            position = 0
+            while True:
+                # 検索順で先頭から結果がそろった分を返す
+                while position < len(pages) and pages[position]['pageid'] in results:
+                    page = pages[position]
+                    if results[page['pageid']]:
+                        yield self._make_result(page, results[page['pageid']])
+                    position += 1
+                
+                if not futures:
+                    break
+                
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_id = futures.pop(future)
+                    html_content, remaining = future.result()
+                    
+                    tracks = []
+                    if html_content:
+                        tracks = self._parse_tracklist_html(html_content, in_section=remaining is not None)
+                    
+                    if tracks or remaining is None:
+                        results[page_id] = tracks
+                        self._store_page(pages_by_id[page_id], tracks)
+                    else:
+                        # 次の候補セクション（なければページ全体）を取得
+                        future = executor.submit(self._fetch_tracklist_html, page_id, remaining)
+                        futures[future] = page_id
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _make_result(self, page_info: Dict, tracks: List[Dict]) -> SearchResult:
+        """検索結果を作成"""
+        return SearchResult(
+            source='wikipedia',
+            album_title=page_info['title'],
+            tracks=tracks,
+            confidence='high',
+            url=f"https://ja.wikipedia.org/?curid={page_info['pageid']}"
+        )
+    
     def _search_pages(self, query: str) -> List[Dict]:
-        """ページ検索"""
+        """
+        ページ検索
+        
+        Returns:
+            検索順のページ情報（pageid, title, revid）
+        """
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'generator': 'search',
+            'gsrsearch': query,
+            'gsrlimit': self.MAX_PAGES,
+            'prop': 'info',
+            'utf8': 1
+        }
+        
+        response = self.session.get(
+            self.API_URL,
+            params=params,
+            timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        
+        return self._parse_pages(response.json())
+    
+    def _search_pages_with_content(self, query: str) -> List[Dict]:
+        """
+        ページ検索（上位ページのウィキテキストも同時に取得）
+        
+        Returns:
+            検索順のページ情報（pageid, title, revid, wikitext）
+        """
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'generator': 'search',
+            'gsrsearch': query,
+            'gsrlimit': self.MAX_PAGES,
+            'prop': 'revisions',
+            'rvprop': 'ids|content',
+            'rvslots': 'main',
+            'utf8': 1
+        }
+        
+        response = self.session.get(
+            self.API_URL,
+            params=params,
+            timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        
+        return self._parse_pages(response.json())
+    
+    def _get_wikitexts(self, page_ids: List[int]) -> Dict[int, Dict]:
+        """
+        複数ページの最新版のウィキテキストをまとめて取得
+        
+        Args:
+            page_ids: ページID
+        
+        Returns:
+            pageid -> {revid, wikitext}
+        """
+        if not page_ids:
+            return {}
+        
         params = {
             'action': 'query',
             'format': 'json',
-            'list': 'search',
-            'srsearch': query,
-            'srlimit': 5,
+            'formatversion': 2,
+            'pageids': '|'.join(str(page_id) for page_id in page_ids),
+            'prop': 'revisions',
+            'rvprop': 'ids|content',
+            'rvslots': 'main',
             'utf8': 1
         }
         
@@ -78,16 +339,68 @@ class WikipediaSearcher:
         )
         response.raise_for_status()
         
-        data = response.json()
-        return data.get('query', {}).get('search', [])
+        return {
+            page['pageid']: {'revid': page['revid'], 'wikitext': page['wikitext']}
+            for page in self._parse_pages(response.json())
+        }
+    
+    def _parse_pages(self, data: Dict) -> List[Dict]:
+        """
+        query API（formatversion=2）の応答からページ情報を取り出す
+        
+        Returns:
+            検索順のページ情報（pageid, title, revid、本文を取得した場合は wikitext）
+        """
+        pages = data.get('query', {}).get('pages', [])
+        
+        # generator の結果は検索順ではないため index で並べ直す
+        pages.sort(key=lambda page: page.get('index', 0))
+        
+        result = []
+        for page in pages:
+            if 'missing' in page:
+                continue
+            
+            info = {
+                'pageid': page['pageid'],
+                'title': page['title'],
+                'revid': page.get('lastrevid')
+            }
+            if 'revisions' in page:
+                revision = page['revisions'][0] if page['revisions'] else {}
+                info['revid'] = revision.get('revid', info['revid'])
+                info['wikitext'] = revision.get('slots', {}).get('main', {}).get('content', '')
+            result.append(info)
+        return result
+    
+    def _fetch_tracklist_html(self, page_id: int,
+                              sections: Optional[List[str]] = None) -> Tuple[str, Optional[List[str]]]:
+        """
+        トラックリストを含むHTMLを1つ取得（通信のみで解析はしない）
+        
+        Args:
+            page_id: ページID
+            sections: 未取得の収録曲セクション番号（Noneの場合は見出し一覧から取得）
+        
+        Returns:
+            (HTML, 残りのセクション番号)、ページ全体を取得した場合は残りがNone
+        """
+        if sections is None:
+            sections = self._find_tracklist_sections(page_id)
+        
+        if sections:
+            return self._fetch_page_html(page_id, section=sections[0]), sections[1:]
+        
+        # ページ全体を取得
+        return self._fetch_page_html(page_id), None
     
-    def _extract_tracklist(self, page_id: int) -> List[Dict]:
-        """ページからトラックリスト抽出"""
+    def _find_tracklist_sections(self, page_id: int) -> List[str]:
+        """収録曲セクションの番号を取得（見出し一覧のみを取得するため軽量）"""
         params = {
             'action': 'parse',
             'format': 'json',
             'pageid': page_id,
-            'prop': 'text'
+            'prop': 'sections'
         }
         
         response = self.session.get(
@@ -96,36 +409,84 @@ class WikipediaSearcher:
             timeout=self.TIMEOUT
         )
         
-        data = response.json()
-        html_content = data['parse']['text']['*']
+        data = self._check_api_error(response.json(), page_id)
+        sections = data.get('parse', {}).get('sections', [])
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        return [
+            section['index'] for section in sections
+            if section.get('index') and (
+                TRACKLIST_HEADING.search(section.get('line', '')) or
+                TRACKLIST_HEADING.search(section.get('anchor', ''))
+            )
+        ]
+    
+    def _fetch_page_html(self, page_id: int, section: Optional[str] = None) -> str:
+        """
+        ページ（またはセクション）のHTMLを取得
+        
+        Args:
+            page_id: ページID
+            section: セクション番号（省略時はページ全体）
+        
+        Returns:
+            HTML
+        
+        Raises:
+            WikipediaApiError: APIがエラーを返した場合（「トラックリストなし」としてキャッシュしないため）
+        """
+        params = {
+            'action': 'parse',
+            'format': 'json',
+            'pageid': page_id,
+            'prop': 'text',
+            'disablelimitreport': 1,
+            'disableeditsection': 1
+        }
+        if section is not None:
+            params['section'] = section
+        
+        response = self.session.get(
+            self.API_URL,
+            params=params,
+            timeout=self.TIMEOUT
+        )
+        
+        data = self._check_api_error(response.json(), page_id, section)
+        return data['parse']['text']['*']
+    
+    def _check_api_error(self, data: Dict, page_id: int, section: Optional[str] = None) -> Dict:
+        """parse APIの応答がエラーであれば WikipediaApiError を送出"""
+        if 'error' in data or 'parse' not in data:
+            error = data.get('error', {})
+            raise WikipediaApiError(
+                f"ページ取得エラー (pageid={page_id}, section={section}): "
+                f"{error.get('code', 'unknown')}: {error.get('info', '')}"
+            )
+        return data
+    
+    def _parse_tracklist_html(self, html_content: str, in_section: bool = False) -> List[Dict]:
+        """
+        HTMLからトラックリストを抽出
+        
+        Args:
+            html_content: ページまたはセクションのHTML
+            in_section: 収録曲セクションのみのHTMLかどうか
+        """
+        document = self.extractor.parse(html_content)
         
         # パターン1: <ol>リスト
-        tracks = self._extract_from_ol(soup)
+        tracks = self._tracks_from_items(self.extractor.list_items(document, in_section))
         
         # パターン2: テーブル
         if not tracks:
-            tracks = self._extract_from_table(soup)
+            tracks = self._tracks_from_rows(self.extractor.table_rows(document))
         
         return tracks
     
-    def _extract_from_ol(self, soup: BeautifulSoup) -> List[Dict]:
-        """<ol>形式からトラック抽出"""
-        # "収録曲" セクションを探す
-        section = soup.find('span', id=re.compile(r'収録曲|トラック.*リスト'))
-        
-        if not section:
-            return []
-        
-        ol = section.find_next('ol')
-        if not ol:
-            return []
-        
+    def _tracks_from_items(self, items: List[str]) -> List[Dict]:
+        """<ol>形式の項目からトラック抽出"""
         tracks = []
-        for idx, li in enumerate(ol.find_all('li'), 1):
-            text = li.get_text(strip=True)
-            
+        for idx, text in enumerate(items, 1):
             # "タイトル (原題: Original Title)" 形式を解析
             title_ja = self._parse_japanese_title(text)
             title_en = self._parse_english_title(text)
@@ -139,25 +500,83 @@ class WikipediaSearcher:
         
         return tracks
     
-    def _extract_from_table(self, soup: BeautifulSoup) -> List[Dict]:
-        """テーブル形式からトラック抽出"""
-        table = soup.find('table', class_='tracklist')
-        
-        if not table:
-            return []
-        
+    def _tracks_from_rows(self, rows: List[List[str]]) -> List[Dict]:
+        """テーブル形式の行からトラック抽出"""
         tracks = []
-        for row in table.find_all('tr')[1:]:  # ヘッダー行スキップ
-            cols = row.find_all('td')
+        for cols in rows:
             if len(cols) >= 2:
                 tracks.append({
                     'number': len(tracks) + 1,
-                    'title_ja': cols[1].get_text(strip=True),
-                    'title_en': cols[2].get_text(strip=True) if len(cols) > 2 else ''
+                    'title_ja': cols[1],
+                    'title_en': cols[2] if len(cols) > 2 else ''
                 })
         
         return tracks
     
+    def _extract_tracklist_from_wikitext(self, wikitext: str) -> List[Dict]:
+        """
+        ウィキテキストからトラックリスト抽出
+        
+        収録曲セクションの最初の番号付きリスト（# 行）を対象とし、HTMLの<ol>から
+        抽出した場合と同じ結果を返す。入れ子のリストやテンプレート、脚注を含むなど
+        描画結果を再現できない場合は空リストを返す（呼び出し元でHTMLから抽出する）。
+        """
+        for section in self._iter_wikitext_sections(wikitext):
+            lines = self._first_numbered_list(section)
+            if not lines:
+                continue
+            
+            items = []
+            for line in lines:
+                body = line[1:]
+                if body[:1] in ('#', '*', ':', ';') or '{{' in body or '<ref' in body:
+                    return []
+                items.append(self._wikitext_to_text(body))
+            
+            return self._tracks_from_items(items)
+        
+        return []
+    
+    def _iter_wikitext_sections(self, wikitext: str) -> Iterator[str]:
+        """収録曲セクションの本文（下位セクションを含む）を順に返す"""
+        headings = list(_WIKI_HEADING.finditer(wikitext))
+        
+        for i, heading in enumerate(headings):
+            if not TRACKLIST_HEADING.search(heading.group(2)):
+                continue
+            
+            level = len(heading.group(1))
+            end = len(wikitext)
+            for following in headings[i + 1:]:
+                if len(following.group(1)) <= level:
+                    end = following.start()
+                    break
+            yield wikitext[heading.end():end]
+    
+    def _first_numbered_list(self, section: str) -> List[str]:
+        """セクション内の最初の番号付きリスト（連続する # 行）"""
+        lines = []
+        for line in section.splitlines():
+            if line.startswith('#'):
+                lines.append(line)
+            elif lines:
+                break
+        return lines
+    
+    def _wikitext_to_text(self, text: str) -> str:
+        """
+        リスト項目のウィキテキストを get_text(strip=True) 相当の文字列に変換
+        
+        get_text(strip=True) はテキストノードごとに前後の空白を除いて連結するため、
+        マークアップの境界で区切ってから同じように連結する。
+        """
+        def replace(match):
+            label = match.group(1) if match.group(1) is not None else match.group(2)
+            return f"{_NODE_BREAK}{label or ''}{_NODE_BREAK}"
+        
+        text = _WIKI_MARKUP.sub(replace, text)
+        return ''.join(html.unescape(part).strip() for part in text.split(_NODE_BREAK))
+    
     def _parse_japanese_title(self, text: str) -> str:
         """日本語タイトルを抽出"""
         # "タイトル (原題: ...)" または "タイトル - ..." 形式
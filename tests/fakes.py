@@ -0,0 +1,105 @@
+"""テスト・ベンチマーク用の合成iTunes（COMオブジェクトの代役）
+
+GetITObjectByID は事前バインディングと同じく基底の IITObject（Kind を持たない）を
+返すため、IITSource へのキャストを忘れると Kind を読めずに失敗する。
+"""
+
+import time
+
+from controllers.com_backend import ComBackend
+
+
+class FakeCom:
+    """合成記録用のCOMオブジェクト（呼び出しごとに一定の遅延を入れる）"""
+    
+    _oleobj_ = None
+    latency = 0.0
+    
+    def __getattribute__(self, name):
+        if not name.startswith('_'):
+            time.sleep(FakeCom.latency)
+        return object.__getattribute__(self, name)
+
+
+class FakeCollection(FakeCom):
+    def __init__(self, items):
+        self._items = items
+        self.Count = len(items)
+    
+    def Item(self, index):
+        return self._items[index - 1]
+    
+    def __iter__(self):
+        return iter(self._items)
+
+
+class FakeTrack(FakeCom):
+    def __init__(self, number):
+        self.Name = f"Track Title {number}"
+        self.Artist = "Sample Artist"
+        self.Duration = 180 + number
+        self.Genre = "Rock"
+        self.Year = 1985
+
+
+class FakePlaylist(FakeCom):
+    def __init__(self, name, num_tracks):
+        self.Name = name
+        self.Tracks = FakeCollection([FakeTrack(i) for i in range(1, num_tracks + 1)])
+
+
+class FakeSource(FakeCom):
+    def __init__(self, source_id, kind, name, playlists):
+        self.sourceID = source_id
+        self.Kind = kind
+        self.Name = name
+        self.Playlists = FakeCollection(playlists)
+    
+    def Refresh(self):
+        pass
+
+
+class FakeObject(FakeCom):
+    """GetITObjectByID の戻り値（事前バインディングでは基底の IITObject として返る）"""
+    
+    def __init__(self, target):
+        self._target = target
+        self.Name = target.Name
+        self.sourceID = target.sourceID
+
+
+def cast_to(obj, interface: str):
+    """win32com.client.CastTo の代役（IITObject を IITSource として扱う）"""
+    if isinstance(obj, FakeObject) and interface == 'IITSource':
+        return obj._target
+    return obj
+
+
+class FakeApp(FakeCom):
+    def __init__(self, num_tracks):
+        library = FakeSource(1, 1, "ライブラリ", [FakePlaylist("ライブラリ", 0)])
+        cd = FakeSource(2, 3, "Sample Album", [FakePlaylist("Sample Album", num_tracks)])
+        self.Sources = FakeCollection([library, cd])
+    
+    def GetITObjectByID(self, source_id, playlist_id, track_id, database_id):
+        for i in range(1, self.Sources.Count + 1):
+            source = self.Sources.Item(i)
+            if source.sourceID == source_id:
+                return FakeObject(source)
+        return None
+
+
+class FakeBackend(ComBackend):
+    """合成iTunesを返すバックエンド"""
+    
+    def __init__(self, num_tracks: int):
+        self.num_tracks = num_tracks
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def dispatch(self, prog_id: str):
+        return FakeApp(self.num_tracks)
+    
+    def cast(self, obj, interface: str):
+        return cast_to(obj, interface)
@@ -0,0 +1,52 @@
+"""CDEventWatcher のイベント処理テスト（iTunesは合成のCOMオブジェクトで代用）"""
+
+import types
+
+import pytest
+
+from controllers import cd_event_watcher
+from controllers.cd_event_watcher import CDEventWatcher
+from tests.fakes import FakeApp, cast_to
+
+
+# 合成iTunesのCDソースのID
+CD_SOURCE_ID = 2
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    """合成iTunesに接続済みの監視（CastTo は合成オブジェクト用の代役に差し替え）"""
+    fake_win32com = types.SimpleNamespace(client=types.SimpleNamespace(CastTo=cast_to))
+    monkeypatch.setattr(cd_event_watcher, 'win32com', fake_win32com, raising=False)
+    
+    inserted = []
+    watcher = CDEventWatcher(on_cd_inserted=inserted.append, is_itunes_running=lambda: True)
+    watcher._app = FakeApp(num_tracks=3)
+    watcher.inserted = inserted
+    return watcher
+
+
+def test_inserted_cd_source_is_reported(watcher):
+    # GetITObjectByID は Kind のない IITObject を返すため、キャストしないと検出できない
+    watcher._on_database_changed((), ((CD_SOURCE_ID, 0, 0, 0),))
+    
+    assert watcher.inserted == [CD_SOURCE_ID]
+
+
+def test_known_cd_source_is_reported_again_after_eject(watcher):
+    watcher._on_database_changed((), ((CD_SOURCE_ID, 0, 0, 0),))
+    watcher._on_database_changed((), ((CD_SOURCE_ID, 0, 0, 0),))
+    watcher._on_database_changed(((CD_SOURCE_ID, 0, 0, 0),), ())
+    watcher._on_database_changed((), ((CD_SOURCE_ID, 0, 0, 0),))
+    
+    assert watcher.inserted == [CD_SOURCE_ID, CD_SOURCE_ID]
+
+
+def test_library_source_is_not_reported(watcher):
+    watcher._on_database_changed((), ((1, 0, 0, 0),))
+    
+    assert watcher.inserted == []
+
+
+def test_current_cd_sources(watcher):
+    assert watcher._current_cd_sources() == {CD_SOURCE_ID}
@@ -0,0 +1,106 @@
+"""iTunesController のCOMセッション再生テスト（記録はフィクスチャ、または合成iTunesから作成）"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from controllers.com_backend import RecordingBackend, ReplayBackend
+from controllers.com_worker import ComWorker
+from controllers.itunes_controller import iTunesController
+from tests.fakes import FakeBackend
+
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'itunes'
+
+# 合成iTunesのCDソースのID
+CD_SOURCE_ID = 2
+
+
+@pytest.fixture
+def make_controller():
+    """テスト終了時にCOM専用スレッドを止めるコントローラを作る"""
+    controllers = []
+    
+    def make(backend):
+        controller = iTunesController(itunes_path='', backend=backend)
+        controllers.append(controller)
+        return controller
+    
+    yield make
+    for controller in controllers:
+        controller.close()
+
+
+def test_source_id_replay_does_not_scan_sources(make_controller):
+    # 記録にはソース一覧（Sources）へのアクセスがないため、走査すると再生に失敗する
+    backend = ReplayBackend(FIXTURE_DIR / 'cd_by_source_id.json', latency_scale=0)
+    assert 'Sources' not in backend.objects[backend.roots['iTunes.Application']]
+    controller = make_controller(backend)
+    
+    cd_info = controller.get_cd_info(source_id=CD_SOURCE_ID)
+    
+    assert cd_info is not None
+    assert cd_info.album == 'Sample Album'
+    assert cd_info.num_tracks == 3
+
+
+def test_source_by_id_is_cast_before_reading_kind(make_controller, tmp_path):
+    # 合成iTunesの GetITObjectByID は事前バインディングと同じく Kind のない IITObject を返す
+    path = tmp_path / 'recording.json'
+    recorder = RecordingBackend(FakeBackend(num_tracks=3), path)
+    controller = make_controller(recorder)
+    
+    cd_info = controller.get_cd_info(source_id=CD_SOURCE_ID)
+    recorder.save()
+    
+    assert cd_info is not None
+    assert cd_info.num_tracks == 3
+    with open(path, 'r', encoding='utf-8') as f:
+        recording = json.load(f)
+    assert 'Sources' not in recording['objects'][recording['roots']['iTunes.Application']]
+
+
+def test_close_does_not_wait_for_running_com_call(make_controller):
+    backend = ReplayBackend(FIXTURE_DIR / 'cd_by_source_id.json', latency_scale=0)
+    controller = make_controller(backend)
+    release = threading.Event()
+    started = threading.Event()
+    
+    def long_call():
+        started.set()
+        release.wait(5)
+    
+    caller = threading.Thread(target=controller._com_worker.call, args=(long_call,))
+    caller.start()
+    assert started.wait(1)
+    
+    started_at = time.monotonic()
+    controller.close()
+    elapsed = time.monotonic() - started_at
+    
+    release.set()
+    caller.join()
+    assert elapsed < 1
+
+
+def test_com_worker_call_timeout_cancels_queued_call():
+    worker = ComWorker('test-com')
+    release = threading.Event()
+    ran = []
+    
+    blocker = threading.Thread(target=worker.call, args=(release.wait, 5))
+    blocker.start()
+    while not worker.is_busy():
+        time.sleep(0.01)
+    
+    with pytest.raises(TimeoutError):
+        worker.call(ran.append, 'queued', timeout=0.1)
+    
+    release.set()
+    blocker.join()
+    worker.shutdown(timeout=1)
+    assert ran == []
+    assert not worker.is_busy()
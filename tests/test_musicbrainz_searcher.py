@@ -0,0 +1,101 @@
+"""MusicBrainzSearcher のリクエスト数テスト（musicbrainzngs の応答はフィクスチャで再現）"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+musicbrainzngs = pytest.importorskip('musicbrainzngs')
+
+from search.musicbrainz_searcher import MusicBrainzSearcher, RELEASE_INCLUDES
+
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'musicbrainz'
+
+# 2トラックのCD（ディスクID検索に使うTOCを演奏時間から作る）
+DURATIONS = [200, 210]
+
+
+def _load(name):
+    with open(FIXTURE_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class FakeMusicBrainz:
+    """フィクスチャを返す musicbrainzngs の代役（呼び出しを記録する）"""
+    
+    def __init__(self, disc_response=None, search_response=None):
+        self.disc_response = disc_response
+        self.search_response = search_response
+        self.releases = _load('releases.json')
+        self.fetched = []
+    
+    def get_releases_by_discid(self, disc_id, includes=None, toc=None, cdstubs=True):
+        assert 'aliases' in includes
+        if self.disc_response is None:
+            raise musicbrainzngs.ResponseError()
+        return self.disc_response
+    
+    def search_releases(self, **kwargs):
+        return self.search_response
+    
+    def get_release_by_id(self, release_id, includes=None):
+        assert includes == RELEASE_INCLUDES
+        self.fetched.append(release_id)
+        return self.releases[release_id]
+
+
+@pytest.fixture
+def make_searcher(monkeypatch):
+    """フィクスチャの応答を返すように musicbrainzngs を差し替えた検索クラスを作る"""
+    # 詳細は1件ずつ取得し、全トラックがそろった時点で打ち切られることを確認できるようにする
+    monkeypatch.setattr(MusicBrainzSearcher, 'MAX_PARALLEL_FETCHES', 1)
+    monkeypatch.setattr(MusicBrainzSearcher, '_rate_limiter', None)
+    
+    def make(fake):
+        for name in ('get_releases_by_discid', 'search_releases', 'get_release_by_id'):
+            monkeypatch.setattr(musicbrainzngs, name, getattr(fake, name))
+        return MusicBrainzSearcher(rate_limit=1000, burst=10)
+    
+    return make
+
+
+def test_disc_id_hit_needs_one_request(make_searcher):
+    fake = FakeMusicBrainz(disc_response=_load('discid_hit.json'))
+    searcher = make_searcher(fake)
+    
+    results = list(searcher.iter_search('Sample Artist', 'Sample Album', durations=DURATIONS))
+    
+    assert searcher.request_count == 1
+    assert fake.fetched == []
+    assert len(results) == 1
+    assert results[0].confidence == 'high'
+    assert [t['title_ja'] for t in results[0].tracks] == ['イエスタデイ', 'レット・イット・ビー']
+
+
+def test_search_fallback_skips_non_japanese_releases(make_searcher):
+    fake = FakeMusicBrainz(search_response=_load('search_mixed.json'))
+    searcher = make_searcher(fake)
+    
+    results = list(searcher.iter_search('Sample Artist', 'Sample Album', durations=DURATIONS))
+    
+    # ディスクID（該当なし）+ 名前検索 + 日本語リリース1件の詳細
+    # （eng/deu のリリースは取得せず、全トラックの邦題がそろった時点で打ち切る）
+    assert searcher.request_count == 3
+    assert fake.fetched == ['rel-jp-1']
+    assert len(results) == 1
+    assert results[0].metadata['mbid'] == 'rel-jp-1'
+    assert [t['title_ja'] for t in results[0].tracks] == ['イエスタデイ', 'レット・イット・ビー']
+
+
+def test_all_releases_ruled_out_fetches_top_release_only(make_searcher):
+    fake = FakeMusicBrainz(search_response=_load('search_non_japanese.json'))
+    searcher = make_searcher(fake)
+    
+    results = list(searcher.iter_search('Sample Artist', 'Sample Album', durations=DURATIONS))
+    
+    # ディスクID（該当なし）+ 名前検索 + 優先度の最も高いリリースの詳細
+    assert searcher.request_count == 3
+    assert fake.fetched == ['rel-uk']
+    assert len(results) == 1
+    assert [t['title_ja'] for t in results[0].tracks] == ['イエスタデイ', None]
@@ -0,0 +1,106 @@
+"""WikipediaSearcher のページキャッシュのテスト（APIの応答はスタブで再現）"""
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from search.cache_manager import CacheManager
+from search.wikipedia_searcher import WikipediaApiError, WikipediaSearcher
+
+
+PAGE_ID = 101
+REVID = 5001
+
+SEARCH_RESPONSE = {
+    'query': {
+        'pages': [
+            {'pageid': PAGE_ID, 'title': 'サンプル・アルバム', 'lastrevid': REVID, 'index': 1}
+        ]
+    }
+}
+
+SECTIONS_RESPONSE = {
+    'parse': {
+        'sections': [
+            {'index': '1', 'line': '背景', 'anchor': '背景'},
+            {'index': '2', 'line': '収録曲', 'anchor': '収録曲'}
+        ]
+    }
+}
+
+SECTION_HTML_RESPONSE = {
+    'parse': {
+        'text': {
+            '*': '<h2 id="収録曲">収録曲</h2><ol><li>イエスタデイ (原題: Yesterday)</li>'
+                 '<li>レット・イット・ビー (原題: Let It Be)</li></ol>'
+        }
+    }
+}
+
+RATELIMITED_RESPONSE = {
+    'error': {'code': 'ratelimited', 'info': "You've exceeded your rate limit."}
+}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+    
+    def json(self):
+        return self._data
+    
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """action / prop ごとに用意した応答を順に返す requests.Session の代役"""
+    
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+    
+    def get(self, url, params=None, timeout=None):
+        key = (params['action'], params['prop'])
+        self.requests.append(key)
+        queue = self.responses[key]
+        return FakeResponse(queue.pop(0) if len(queue) > 1 else queue[0])
+
+
+@pytest.fixture
+def page_cache(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_api_error_is_raised_and_not_cached(page_cache):
+    searcher = WikipediaSearcher(batch_fetch=False, page_cache=page_cache)
+    searcher.session = FakeSession({
+        ('query', 'info'): [SEARCH_RESPONSE],
+        ('parse', 'sections'): [SECTIONS_RESPONSE],
+        ('parse', 'text'): [RATELIMITED_RESPONSE, SECTION_HTML_RESPONSE]
+    })
+    
+    # エラー応答は「トラックリストなし」ではなく失敗として送出する
+    with pytest.raises(WikipediaApiError):
+        list(searcher.iter_search('Sample Artist', 'Sample Album'))
+    assert page_cache.get_pages([PAGE_ID]) == {}
+    
+    # 次の検索ではページを取得し直す
+    results = list(searcher.iter_search('Sample Artist', 'Sample Album'))
+    
+    assert len(results) == 1
+    assert [t['title_ja'] for t in results[0].tracks] == ['イエスタデイ', 'レット・イット・ビー']
+    assert page_cache.get_pages([PAGE_ID]) == {PAGE_ID: (REVID, results[0].tracks)}
+
+
+def test_search_returns_empty_on_api_error():
+    searcher = WikipediaSearcher(batch_fetch=False)
+    searcher.session = FakeSession({
+        ('query', 'info'): [SEARCH_RESPONSE],
+        ('parse', 'sections'): [SECTIONS_RESPONSE],
+        ('parse', 'text'): [RATELIMITED_RESPONSE]
+    })
+    
+    assert searcher.search('Sample Artist', 'Sample Album') == []
@@ -55,6 +55,10 @@ class ConfigManager:
         """整数値を取得"""
         return self.config.getint(section, key, fallback=fallback)
     
+    def getfloat(self, section: str, key: str, fallback: float = 0.0) -> float:
+        """小数値を取得"""
+        return self.config.getfloat(section, key, fallback=fallback)
+    
     def set(self, section: str, key: str, value: str):
         """設定値を設定"""
         if not self.config.has_section(section):
@@ -74,6 +78,9 @@ class ConfigManager:
         self.config.set('Options', 'itunes_startup_wait', '10')
         self.config.set('Options', 'cd_recognition_wait', '5')
         self.config.set('Options', 'itunes_shutdown_wait', '3')
+        self.config.set('Options', 'process_check_interval', '2')
+        self.config.set('Options', 'auto_detect_cd', 'true')
+        self.config.set('Options', 'auto_search_on_insert', 'true')
         self.config.set('Options', 'log_level', 'INFO')
         self.config.set('Options', 'auto_launch_eac', 'true')
         self.config.set('Options', 'play_sound_on_complete', 'true')
@@ -89,14 +96,20 @@ class ConfigManager:
         self.config.set('GUI', 'window_height', '700')
         self.config.set('GUI', 'theme', 'default')
         self.config.set('GUI', 'max_log_lines', '1000')
+        self.config.set('GUI', 'status_refresh_interval', '1')
         
         # WebSearch
         self.config.add_section('WebSearch')
         self.config.set('WebSearch', 'enable_web_search', 'true')
         self.config.set('WebSearch', 'use_wikipedia_ja', 'true')
+        self.config.set('WebSearch', 'wikipedia_batch_fetch', 'true')
+        self.config.set('WebSearch', 'wikipedia_html_parser', 'auto')
         self.config.set('WebSearch', 'use_musicbrainz', 'true')
         self.config.set('WebSearch', 'use_general_search', 'false')
         self.config.set('WebSearch', 'search_timeout', '30')
+        self.config.set('WebSearch', 'source_timeout', '20')
+        self.config.set('WebSearch', 'musicbrainz_rate_limit', '1.0')
+        self.config.set('WebSearch', 'musicbrainz_burst', '2')
         self.config.set('WebSearch', 'max_candidates', '5')
         self.config.set('WebSearch', 'search_priority', 'wikipedia,musicbrainz,general')
         
@@ -106,12 +119,16 @@ class ConfigManager:
         self.config.set('SearchBehavior', 'auto_apply_threshold', '80')
         self.config.set('SearchBehavior', 'warn_low_confidence', 'true')
         self.config.set('SearchBehavior', 'low_confidence_threshold', '60')
+        self.config.set('SearchBehavior', 'match_mode', 'greedy')
         
         # Cache
         self.config.add_section('Cache')
         self.config.set('Cache', 'enable_cache', 'true')
         self.config.set('Cache', 'cache_expire_days', '30')
+        self.config.set('Cache', 'negative_cache_expire_days', '1')
         self.config.set('Cache', 'max_cache_size_mb', '100')
+        self.config.set('Cache', 'memory_cache_entries', '256')
+        self.config.set('Cache', 'memory_cache_size_mb', '16')
         self.config.set('Cache', 'cache_dir', 'cache')
         
         # Display
@@ -1,15 +1,49 @@
 """履歴管理モジュール"""
 
+import os
 import json
+import uuid
+import sqlite3
+import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from models.cd_info import CDInfo
 
 
 class HistoryManager:
-    """CD処理履歴管理クラス"""
+    """CD処理履歴管理クラス（追記型ログ + SQLite索引）"""
+    
+    LOG_NAME = "history.jsonl"
+    INDEX_NAME = "history_index.db"
+    LEGACY_NAME = "history.json"
+    
+    # 無効レコード（clearより前の記録・壊れた行）がこの件数以上かつ
+    # 有効レコードより多くなったら読み込み時に圧縮する
+    COMPACT_MIN_DEAD_RECORDS = 100
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            id           INTEGER PRIMARY KEY,
+            date         TEXT NOT NULL,
+            artist       TEXT NOT NULL,
+            album        TEXT NOT NULL,
+            search_text  TEXT NOT NULL,
+            entry        TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_date ON entries (date);
+        CREATE INDEX IF NOT EXISTS idx_entries_artist ON entries (artist COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_entries_album ON entries (album COLLATE NOCASE);
+        
+        CREATE TABLE IF NOT EXISTS index_state (
+            id           INTEGER PRIMARY KEY CHECK (id = 0),
+            generation   TEXT,
+            log_size     INTEGER NOT NULL,
+            dead_records INTEGER NOT NULL
+        );
+    """
     
     def __init__(self, history_dir: str = "history"):
         """
@@ -20,25 +54,227 @@ class HistoryManager:
         """
         self.history_dir = Path(history_dir)
         self.history_dir.mkdir(exist_ok=True)
-        self.history_file = self.history_dir / "history.json"
-        self._history: List[Dict] = []
+        self.history_file = self.history_dir / self.LOG_NAME
+        self.index_file = self.history_dir / self.INDEX_NAME
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.index_file), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+        self._fts = self._create_fts()
+        self._conn.commit()
+        
+        self._generation: Optional[str] = None
+        self._log_size = 0
+        self._dead_records = 0
         self.load()
     
+    def _create_fts(self) -> bool:
+        """トライグラム全文検索索引を作成（SQLiteが未対応の場合はFalse）"""
+        try:
+            self._conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    search_text, content='entries', content_rowid='id', tokenize='trigram'
+                )
+                """
+            )
+            return True
+        except sqlite3.OperationalError:
+            self.logger.info("SQLiteがトライグラム索引に未対応のため、部分一致検索を使用します")
+            return False
+    
     def load(self):
-        """履歴を読み込む"""
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self._history = json.load(f)
-            except Exception:
-                self._history = []
-        else:
-            self._history = []
+        """履歴を読み込む（前回の索引以降に追記された分だけを反映）"""
+        with self._lock:
+            if not self.history_file.exists():
+                self._reset_index(None)
+                self._migrate_legacy_file()
+                return
+            
+            self._truncate_torn_tail()
+            
+            row = self._conn.execute(
+                'SELECT generation, log_size, dead_records FROM index_state WHERE id = 0'
+            ).fetchone()
+            log_size = self.history_file.stat().st_size
+            generation = self._read_generation()
+            
+            if row and row[0] == generation and row[1] <= log_size:
+                # 索引済みの位置から続きを読む
+                self._generation, self._log_size, self._dead_records = row
+            else:
+                # 圧縮・手動編集などでログが変わっているため作り直す
+                self._reset_index(generation)
+            
+            self._replay_from(self._log_size)
+            
+            if (self._dead_records >= self.COMPACT_MIN_DEAD_RECORDS and
+                    self._dead_records > self.count()):
+                self.compact()
+    
+    def _truncate_torn_tail(self):
+        """書き込み途中で終了した末尾の不完全な行を切り詰める"""
+        size = self.history_file.stat().st_size
+        if size == 0:
+            return
+        
+        with open(self.history_file, 'r+b') as f:
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            
+            # 末尾から最後の改行を探す
+            pos = size
+            valid_length = 0
+            while pos > 0:
+                chunk_start = max(0, pos - 65536)
+                f.seek(chunk_start)
+                chunk = f.read(pos - chunk_start)
+                newline = chunk.rfind(b'\n')
+                if newline >= 0:
+                    valid_length = chunk_start + newline + 1
+                    break
+                pos = chunk_start
+            
+            self.logger.warning("履歴ファイル末尾の不完全なレコードを破棄します")
+            f.truncate(valid_length)
+    
+    def _read_generation(self) -> Optional[str]:
+        """ログ先頭のヘッダーから世代IDを取得（圧縮のたびに変わる）"""
+        with open(self.history_file, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+        try:
+            record = json.loads(first_line)
+        except ValueError:
+            return None
+        if isinstance(record, dict) and record.get('op') == 'header':
+            return record.get('generation')
+        return None
+    
+    def _reset_index(self, generation: Optional[str]):
+        """索引を空にする"""
+        self._generation = generation
+        self._log_size = 0
+        self._dead_records = 0
+        with self._conn:
+            self._conn.execute('DELETE FROM entries')
+            if self._fts:
+                self._conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+            self._save_state()
+    
+    def _save_state(self):
+        """索引の同期位置を保存（索引の更新と同じトランザクション内で呼ぶこと）"""
+        self._conn.execute(
+            """
+            INSERT INTO index_state (id, generation, log_size, dead_records)
+            VALUES (0, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                generation = excluded.generation,
+                log_size = excluded.log_size,
+                dead_records = excluded.dead_records
+            """,
+            (self._generation, self._log_size, self._dead_records)
+        )
+    
+    def _replay_from(self, offset: int):
+        """ログの指定位置以降のレコードを索引に反映"""
+        with open(self.history_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        
+        if not data:
+            return
+        
+        with self._conn:
+            for line in data.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    self._dead_records += 1
+                    continue
+                self._apply(record)
+            
+            self._log_size = offset + len(data)
+            self._save_state()
+    
+    def _apply(self, record: Dict):
+        """ログレコードを1件索引に反映（トランザクション内で呼ぶこと）"""
+        op = record.get('op')
+        if op == 'add':
+            self._insert(record['entry'])
+        elif op == 'clear':
+            self._dead_records += self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] + 1
+            self._conn.execute('DELETE FROM entries')
+            if self._fts:
+                self._conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+        elif op != 'header':
+            self._dead_records += 1
+    
+    def _insert(self, entry: Dict):
+        """エントリを1件索引に追加"""
+        search_text = self._search_text(entry)
+        cursor = self._conn.execute(
+            'INSERT INTO entries (date, artist, album, search_text, entry) VALUES (?, ?, ?, ?, ?)',
+            (
+                entry.get('date', ''),
+                entry.get('artist', ''),
+                entry.get('album', ''),
+                search_text,
+                json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+            )
+        )
+        if self._fts:
+            self._conn.execute(
+                'INSERT INTO entries_fts (rowid, search_text) VALUES (?, ?)',
+                (cursor.lastrowid, search_text)
+            )
+    
+    @staticmethod
+    def _search_text(entry: Dict) -> str:
+        """全文検索の対象文字列（アーティスト・アルバム・各トラックのタイトル）"""
+        parts = [entry.get('artist', ''), entry.get('album', '')]
+        for track in entry.get('cd_info', {}).get('tracks', []):
+            for key in ('title_en', 'title_ja'):
+                if track.get(key):
+                    parts.append(track[key])
+        return '\n'.join(parts).lower()
+    
+    def _append(self, record: Dict):
+        """ログレコードを1件追記（fsyncまで行う）"""
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with open(self.history_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_size += len(line)
     
     def save(self):
-        """履歴を保存"""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(self._history, f, ensure_ascii=False, indent=2)
+        """履歴を保存（ログを現在の内容で書き直す）"""
+        self.compact()
+    
+    def compact(self):
+        """ログを有効なレコードだけに圧縮（一時ファイルに書いて置き換える）"""
+        with self._lock:
+            generation = uuid.uuid4().hex
+            tmp_file = self.history_file.with_name(self.history_file.name + '.tmp')
+            
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'op': 'header', 'generation': generation}) + '\n')
+                for (entry_json,) in self._conn.execute('SELECT entry FROM entries ORDER BY id'):
+                    f.write('{"op":"add","entry":' + entry_json + '}\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.history_file)
+            
+            self._generation = generation
+            self._log_size = self.history_file.stat().st_size
+            self._dead_records = 0
+            with self._conn:
+                self._save_state()
     
     def add(self, cd_info: CDInfo, status: str = "success"):
         """
@@ -65,16 +301,26 @@ class HistoryManager:
             'cd_info': cd_info.to_dict()
         }
         
-        self._history.append(entry)
-        self.save()
+        with self._lock:
+            self._append({'op': 'add', 'entry': entry})
+            with self._conn:
+                self._insert(entry)
+                self._save_state()
+    
+    def count(self) -> int:
+        """履歴件数を取得"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
     
     def get_all(self) -> List[Dict]:
         """全履歴を取得"""
-        return self._history.copy()
+        with self._lock:
+            rows = self._conn.execute('SELECT entry FROM entries ORDER BY id').fetchall()
+        return [json.loads(entry_json) for (entry_json,) in rows]
     
     def search(self, query: str) -> List[Dict]:
         """
-        履歴を検索
+        履歴を検索（アーティスト・アルバム・トラックタイトルの部分一致）
         
         Args:
             query: 検索クエリ
@@ -82,15 +328,73 @@ class HistoryManager:
         Returns:
             検索結果
         """
-        query_lower = query.lower()
-        results = []
+        entries, _ = self.query(text=query, order='id', limit=None)
+        return entries
+    
+    def query(self, text: Optional[str] = None,
+              artist: Optional[str] = None,
+              album: Optional[str] = None,
+              date_from: Optional[str] = None,
+              date_to: Optional[str] = None,
+              order: str = 'date',
+              offset: int = 0,
+              limit: Optional[int] = 50) -> Tuple[List[Dict], int]:
+        """
+        索引を使って履歴を検索（ページ単位）
         
-        for entry in self._history:
-            if (query_lower in entry.get('artist', '').lower() or
-                query_lower in entry.get('album', '').lower()):
-                results.append(entry)
+        Args:
+            text: 部分一致で探す文字列（アーティスト・アルバム・トラックタイトル）
+            artist: アーティスト名（完全一致、大文字小文字無視）
+            album: アルバム名（完全一致、大文字小文字無視）
+            date_from: この日時以降（ISO形式）
+            date_to: この日時より前（ISO形式）
+            order: 'date'（新しい順）または 'id'（登録順）
+            offset: 取得開始位置
+            limit: 取得件数（Noneで全件）
+        
+        Returns:
+            (該当する履歴, 該当件数)
+        """
+        conditions = []
+        params: List = []
         
-        return results
+        if text:
+            text = text.lower()
+            if self._fts and len(text) >= 3:
+                conditions.append(
+                    'e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)'
+                )
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                conditions.append("e.search_text LIKE ? ESCAPE '\\'")
+                params.append(f'%{escaped}%')
+        if artist is not None:
+            conditions.append('e.artist = ? COLLATE NOCASE')
+            params.append(artist)
+        if album is not None:
+            conditions.append('e.album = ? COLLATE NOCASE')
+            params.append(album)
+        if date_from:
+            conditions.append('e.date >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append('e.date < ?')
+            params.append(date_to)
+        
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        order_by = 'e.date DESC, e.id' if order == 'date' else 'e.id'
+        
+        with self._lock:
+            total = self._conn.execute(
+                f'SELECT COUNT(*) FROM entries e {where}', params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f'SELECT e.entry FROM entries e {where} ORDER BY {order_by} LIMIT ? OFFSET ?',
+                params + [-1 if limit is None else limit, offset]
+            ).fetchall()
+        
+        return [json.loads(entry_json) for (entry_json,) in rows], total
     
     def get_latest(self, limit: int = 10) -> List[Dict]:
         """
@@ -102,14 +406,38 @@ class HistoryManager:
         Returns:
             最新の履歴
         """
-        return sorted(
-            self._history,
-            key=lambda x: x.get('date', ''),
-            reverse=True
-        )[:limit]
+        entries, _ = self.query(limit=limit)
+        return entries
     
     def clear(self):
         """履歴をクリア"""
-        self._history = []
-        self.save()
-
+        with self._lock:
+            self._append({'op': 'clear'})
+            with self._conn:
+                self._apply({'op': 'clear'})
+                self._save_state()
+    
+    def close(self):
+        """索引データベースを閉じる"""
+        with self._lock:
+            self._conn.close()
+    
+    def _migrate_legacy_file(self):
+        """旧形式（history.json）を追記型ログに変換する"""
+        legacy_file = self.history_dir / self.LEGACY_NAME
+        if not legacy_file.exists():
+            return
+        
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"旧履歴ファイルの読み込みに失敗: {e}")
+            return
+        
+        with self._conn:
+            for entry in entries:
+                self._insert(entry)
+        self.compact()
+        legacy_file.replace(legacy_file.with_name(legacy_file.name + '.bak'))
+        self.logger.info(f"履歴を追記型ログに移行しました: {len(entries)}件")